@@ -0,0 +1,176 @@
+import pygame, os, threading
+from collections import OrderedDict
+from settings import *
+from bundle import read_bundle, keeps_alpha, is_stale
+
+
+class AssetCache:
+    """
+    class that loads every image of the game once and shares it between all the sprites that use it
+    """
+    def __init__(self, folder=img_folder):
+        """
+        initializes the cache for the images in the given folder
+        """
+        self.folder = folder
+        self.images = {}                    # converted images keyed by (file name, flipped)
+        self.masks = {}                     # collision masks of the images keyed by the image surface
+        self.hits = 0                       # amount of loads answered from the cache
+        self.disk_loads = 0                 # amount of loads that had to read the file
+        self.bundle_loads = 0               # amount of images taken from an asset bundle
+
+    def image(self, name, flip=False):
+        """
+        returns the shared image for the file name, flipped horizontally if asked, with black as transparent color,
+        images of ALPHA_IMAGES also keep the per pixel alpha of their file
+        """
+        key = (name, flip)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        if flip:
+            image = pygame.transform.flip(self.image(name), True, False)
+        else:
+            self.disk_loads += 1
+            image = pygame.image.load(os.path.join(self.folder, name))
+            image = image.convert_alpha() if keeps_alpha(name, image) else image.convert()
+        image.set_colorkey(BLACK, pygame.RLEACCEL)    # run length encoding skips the transparent pixels when blitting
+        self.images[key] = image
+        self.mask(image)
+        return image
+
+    def mask(self, image):
+        """
+        returns the collision mask of the opaque pixels of an image, made once per image
+        """
+        mask = self.masks.get(image)
+        if mask is None:
+            mask = pygame.mask.from_surface(image)
+            self.masks[image] = mask
+        return mask
+
+    def solid(self, size, color):
+        """
+        returns a shared surface of the size filled with color, platforms of the same size use the same one
+        """
+        key = (size, color)
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.Surface(size)
+            image.fill(color)
+            self.images[key] = image
+        return image
+
+    def load_bundle(self, path):
+        """
+        adds the pre-decoded images of an asset bundle to the cache
+        """
+        for name, image in read_bundle(path).items():
+            image.set_colorkey(BLACK, pygame.RLEACCEL)
+            self.images[name, False] = image
+            self.mask(image)
+            self.bundle_loads += 1
+
+    def preload(self, names=BUNDLE_IMAGES, flipped=FLIPPED_IMAGES, bundle=BUNDLE_FILE):
+        """
+        loads and converts all the images before the game starts so no sprite has to load from disk, from the asset
+        bundle when there is one that is newer than the image files and from the image files otherwise
+        """
+        if bundle is not None and os.path.exists(bundle) and not is_stale(bundle, names, self.folder):
+            self.load_bundle(bundle)
+        for name in names:
+            self.image(name)
+        for name in flipped:
+            self.image(name, True)
+
+    def stats(self):
+        """
+        returns how many loads hit the cache and how many went to disk
+        """
+        return {"hits": self.hits, "disk_loads": self.disk_loads, "bundle_loads": self.bundle_loads,
+                "images": len(self.images), "masks": len(self.masks)}
+
+
+class AssetLoader(threading.Thread):
+    """
+    thread that preloads the asset cache in the background, so the start screen shows while the images load
+    """
+    def __init__(self, cache, then=None, bundle=BUNDLE_FILE):
+        """
+        initializes the loader for the cache and the asset bundle, then is called on the thread after the images
+        are loaded
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.cache = cache
+        self.bundle = bundle
+        self.then = then
+        self.error = None                   # exception the loading failed with, raised again by wait
+
+    def run(self):
+        """
+        loads the images
+        """
+        try:
+            self.cache.preload(bundle=self.bundle)
+            if self.then is not None:
+                self.then()
+        except Exception as error:
+            self.error = error
+
+    def wait(self):
+        """
+        waits until the images are loaded, raising the error of the loading if it failed
+        """
+        if self.is_alive():
+            self.join()
+        if self.error is not None:
+            raise self.error
+
+
+class TextCache:
+    """
+    class that keeps fonts and rendered text around so unchanged text is only rendered once
+    """
+    def __init__(self, face=FONT_NAME, capacity=TEXT_CACHE_SIZE):
+        """
+        initializes the font cache and the text cache that holds at most capacity rendered texts
+        """
+        self.face = face
+        self.capacity = capacity
+        self.font_paths = {}                # font files found by match_font keyed by face
+        self.fonts = {}                     # fonts keyed by (face, size)
+        self.surfaces = OrderedDict()       # rendered texts keyed by (text, size, color), least recently used first
+
+    def font(self, size, face=None):
+        """
+        returns the font for the face and size, only looking the face up in the system fonts once
+        """
+        face = face or self.face
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if face not in self.font_paths:
+                self.font_paths[face] = pygame.font.match_font(face)
+            font = pygame.font.Font(self.font_paths[face], size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color):
+        """
+        returns the surface of the text, rendering it only if it is not in the cache
+        """
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:          # throws away the text that was used the longest time ago
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+asset_cache = AssetCache()
+text_cache = TextCache()
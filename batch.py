@@ -0,0 +1,121 @@
+import time
+import json
+import argparse
+import multiprocessing
+from game import Game
+from benchmark import percentile
+from policies import RandomPolicy, ScriptedPolicy, RUN_AND_GUN
+from settings import *
+
+POLICIES = ["random", "scripted", "recorded"]
+
+game = None                                 # headless game of the worker process, made once and reused for every run
+
+
+def start_worker(level, batched):
+    """
+    makes the headless game a worker process plays all its runs with
+    """
+    global game
+    game = Game(headless=True, level=level, batched=batched)
+
+
+def make_policy(name, seed):
+    """
+    returns the policy called name, None for recorded runs which are played from the replay of the game
+    """
+    if name == "random":
+        return RandomPolicy(seed)
+    if name == "scripted":
+        return ScriptedPolicy(RUN_AND_GUN)
+    return None
+
+
+def play(job):
+    """
+    plays one game in the worker process and returns its outcome
+    """
+    seed, policy, replay, max_ticks = job
+    game.seed = seed
+    game.policy = make_policy(policy, seed)
+    game.replay = replay
+    start = time.perf_counter()
+    ticks = game.simulate(max_ticks)
+    seconds = time.perf_counter() - start
+    if replay is not None:                  # replays are played with the seed they were recorded with
+        seed = game.input.seed
+    return {"seed": seed, "kills": game.kills, "win": bool(game.win), "ticks": ticks,
+            "died": not game.win and ticks < max_ticks and not game.input.finished,
+            "ms_per_tick": seconds * 1000 / max(ticks, 1)}
+
+
+def aggregate(outcomes, seconds, workers):
+    """
+    returns the report of all runs: win rate, kills, survival and cost of a tick, and how fast the runs went
+    """
+    report = {"runs": len(outcomes), "workers": workers, "seconds": seconds,
+              "runs_per_second": len(outcomes) / seconds if seconds else 0.0,
+              "ticks_per_second": sum(outcome["ticks"] for outcome in outcomes) / seconds if seconds else 0.0}
+    if not outcomes:
+        return report
+    report["win_rate"] = sum(outcome["win"] for outcome in outcomes) / len(outcomes)
+    report["death_rate"] = sum(outcome["died"] for outcome in outcomes) / len(outcomes)
+    for key in ("kills", "ticks", "ms_per_tick"):
+        values = sorted(outcome[key] for outcome in outcomes)
+        report[key] = {"mean": sum(values) / len(values), "min": values[0], "p50": percentile(values, 50),
+                       "p95": percentile(values, 95), "max": values[-1]}
+    return report
+
+
+def run_batch(runs, policy="random", workers=None, max_ticks=FPS*300, seed=0, replay=None, level=LEVEL_FILE, batched=False):
+    """
+    plays runs headless games spread over a pool of worker processes and returns the aggregated report and the
+    outcome of every run, a replay plays the same every time so it is played in one run
+    """
+    if replay is not None and runs != 1:
+        raise ValueError("a replay plays out the same every time, play it in one run")
+    if policy == "recorded" and replay is None:
+        raise ValueError("the recorded policy plays a replay, pass the input log to play")
+    workers = workers or multiprocessing.cpu_count()
+    jobs = [(seed + run, policy, replay, max_ticks) for run in range(runs)]
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(workers, start_worker, (level, batched))
+    outcomes = list(pool.imap_unordered(play, jobs, chunksize=max(1, runs // (workers * 8))))
+    pool.close()                            # the workers are let out instead of terminated, SDL catches SIGTERM
+    pool.join()
+    seconds = time.perf_counter() - start
+    outcomes.sort(key=lambda outcome: outcome["seed"])
+    return aggregate(outcomes, seconds, workers), outcomes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="play many headless games in parallel and report their outcomes")
+    parser.add_argument("--runs", type=int, help="amount of games to play (default: 100, 1 for the recorded policy)")
+    parser.add_argument("--policy", choices=POLICIES, default="random", help="who plays the games")
+    parser.add_argument("--replay", help="input log the recorded policy plays")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--max-ticks", type=int, default=FPS*300, help="updates after which a game is stopped")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, the others count up from it")
+    parser.add_argument("--level", default=LEVEL_FILE, help=".csv or binary level file to play")
+    parser.add_argument("--batched", action="store_true", help="move and collide bots and bullets with numpy")
+    parser.add_argument("--runs-output", help="file to write the outcome of every run to as json")
+    parser.add_argument("--output", help="file to write the json report to (default: print it)")
+    args = parser.parse_args()
+    if args.policy == "recorded" and not args.replay:
+        parser.error("the recorded policy needs --replay")
+    if args.policy == "recorded" and args.runs not in (None, 1):
+        parser.error("the recorded policy plays the same game every run, it only runs once")
+    if args.policy != "recorded":           # only the recorded policy plays the replay
+        args.replay = None
+    runs = args.runs if args.runs is not None else (1 if args.policy == "recorded" else 100)
+
+    report, outcomes = run_batch(runs, args.policy, args.workers, args.max_ticks, args.seed, args.replay, args.level, args.batched)
+    if args.runs_output:
+        with open(args.runs_output, "w") as file:
+            json.dump(outcomes, file, indent=2)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
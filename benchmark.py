@@ -0,0 +1,221 @@
+import pygame
+import random
+import time
+import json
+import argparse
+import platform
+import subprocess
+from game import Game
+from assets import asset_cache
+from sprites import *
+from inputs import ScriptedInput
+from level import Level
+from entities import FLYINGBOT, GROUNDBOT
+
+PHASES = ["events", "update", "draw"]       # parts of a frame that get timed
+
+
+def percentile(values, percent):
+    """
+    returns the value below which percent of the sorted values fall
+    """
+    index = min(len(values)-1, int(round(percent/100 * (len(values)-1))))
+    return values[index]
+
+
+def summarize(samples):
+    """
+    returns the mean, p95 and p99 of a list of timings in milliseconds
+    """
+    ordered = sorted(samples)
+    return {"mean": sum(ordered)/len(ordered), "p95": percentile(ordered, 95), "p99": percentile(ordered, 99)}
+
+
+def keep_on_ground(game):
+    """
+    puts the player back on the floor so long runs are not ended by falling through gaps
+    """
+    if game.player.position.y > HEIGHT - 40:
+        game.player.position.y = HEIGHT - 40 + 1
+        game.player.velocity.y = 0
+
+
+class Scenario:
+    """
+    base class of a benchmark scenario, it sets a game up and changes it before every frame
+    """
+    name = ""
+    frames = 600
+
+    def script(self, tick):
+        """
+        returns the keys held and events done by the player at the tick
+        """
+        return (), []
+
+    def setup(self, game):
+        """
+        prepares the game after a new round was created
+        """
+
+    def before_frame(self, game):
+        """
+        changes the game before a frame, not part of the timing
+        """
+
+    def teardown(self, game):
+        """
+        undoes what setup changed outside of the round, the next scenario plays on the same game
+        """
+
+
+class Bots(Scenario):
+    """
+    keeps a fixed amount of bots alive on the screen
+    """
+    def __init__(self, amount):
+        self.amount = amount
+        self.name = f"bots_{amount}"
+        self.cap = None                     # cap of the bots before the scenario raised it
+
+    def setup(self, game):
+        self.cap = game.lifetime.caps["bots"]
+        if self.cap is not None:            # the cap would despawn the bots the scenario wants to keep
+            game.lifetime.caps["bots"] = max(self.cap, self.amount)
+
+    def teardown(self, game):
+        game.lifetime.caps["bots"] = self.cap
+
+    def before_frame(self, game):
+        keep_on_ground(game)
+        while len(game.bots) < self.amount:
+            bot = game.spawn_bot(*random.choice(((game.flyingbot_pool, FLYINGBOT), (game.groundbot_pool, GROUNDBOT))))
+            bot.rect.x = game.camera.x + random.randrange(WIDTH//4, WIDTH)
+            if game.entities is not None:
+                game.entities.place(bot)
+
+
+class BulletStream(Scenario):
+    """
+    the player shoots every frame at random points on the screen
+    """
+    name = "bullet_stream"
+
+    def script(self, tick):
+        target = (random.randrange(WIDTH), random.randrange(HEIGHT))
+        return (), [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=target, button=1)]
+
+    def before_frame(self, game):
+        keep_on_ground(game)
+
+
+class ScrollRun(Scenario):
+    """
+    the player runs right across the whole level
+    """
+    name = "scroll_run"
+
+    def __init__(self):
+        self.frames = int(Level.load(LEVEL_FILE).end // 5)
+
+    def script(self, tick):
+        return (pygame.K_d,), []
+
+    def before_frame(self, game):
+        keep_on_ground(game)
+
+
+class BossFight(Scenario):
+    """
+    the boss stands on the screen and fires several bullets at the player every frame
+    """
+    name = "boss_fight"
+    bullets_per_frame = 5
+
+    def setup(self, game):
+        for _ in range(HARDER_KILLS + 1):   # boss starts shooting after 5 kills
+            game.add_kill()
+        game.boss.rect.right = WIDTH
+
+    def before_frame(self, game):
+        keep_on_ground(game)
+        for _ in range(self.bullets_per_frame):
+            game.spawn_boss_bullet(game.player.rect.centerx, random.randrange(HEIGHT))
+
+
+SCENARIOS = [Bots(10), Bots(100), Bots(1000), Bots(10000), BulletStream(), ScrollRun(), BossFight()]
+
+
+def run_scenario(game, scenario, frames=None, warmup=30):
+    """
+    runs the scenario on a new round of the game and returns the timings of every phase of the frame
+    """
+    frames = frames or scenario.frames
+    game.setup()
+    game.input = ScriptedInput(scenario.script, game.sim_clock)
+    scenario.setup(game)
+    samples = {phase: [] for phase in PHASES + ["frame"]}
+    for frame in range(warmup + frames):
+        scenario.before_frame(game)
+        start = time.perf_counter()
+        game.events()
+        events_done = time.perf_counter()
+        game.update()
+        update_done = time.perf_counter()
+        game.draw()
+        draw_done = time.perf_counter()
+        if frame < warmup:
+            continue
+        samples["events"].append((events_done - start) * 1000)
+        samples["update"].append((update_done - events_done) * 1000)
+        samples["draw"].append((draw_done - update_done) * 1000)
+        samples["frame"].append((draw_done - start) * 1000)
+    result = {"frames": frames,
+              "phases": {phase: summarize(values) for phase, values in samples.items()},
+              "entities": {"bots": len(game.bots), "bullets": len(game.bullets), "boss_bullets": len(game.boss_bullets),
+                           "platforms": len(game.platforms)},
+              "pools": game.pool_stats(),
+              "lifetime": game.lifetime.stats()}
+    scenario.teardown(game)
+    return result
+
+
+def commit():
+    """
+    returns the git commit the benchmark runs on, or None outside of a checkout
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=game_folder or None).stdout.strip() or None
+    except OSError:
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="benchmark the game loop in scripted scenarios")
+    parser.add_argument("--scenario", action="append", choices=[scenario.name for scenario in SCENARIOS],
+                        help="scenario to run, can be given several times (default: all)")
+    parser.add_argument("--frames", type=int, help="frames to time per scenario (default: per scenario)")
+    parser.add_argument("--warmup", type=int, default=30, help="frames to run before timing starts")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random numbers")
+    parser.add_argument("--output", help="file to write the json report to (default: print it)")
+    parser.add_argument("--batched", action="store_true", help="move and collide bots and bullets with numpy")
+    parser.add_argument("--pixel-perfect", action="store_true", help="only hit where opaque pixels overlap")
+    args = parser.parse_args()
+
+    g = Game(headless=True, seed=args.seed, batched=args.batched, pixel_perfect=args.pixel_perfect)
+    report = {"commit": commit(), "python": platform.python_version(), "pygame": pygame.version.ver,
+              "seed": args.seed, "batched": args.batched, "pixel_perfect": args.pixel_perfect,
+              "scenarios": {}}
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        report["scenarios"][scenario.name] = run_scenario(g, scenario, args.frames, args.warmup)
+    report["assets"] = asset_cache.stats()      # loads that hit the image cache versus the ones from disk or the bundle
+    pygame.quit()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
@@ -0,0 +1,78 @@
+import pygame, mmap, os, struct, sys
+from settings import *
+
+# layout of an asset bundle: a header with the amount of images, an entry with the name, size, bytes per pixel and
+# offset of the pixels of every image, then the rgb or rgba pixels of all images one after the other
+BUNDLE_HEADER = struct.Struct("<4sI")
+BUNDLE_ENTRY = struct.Struct("<64sIIBQ")
+BUNDLE_MAGIC = b"RRA2"
+PIXEL_FORMATS = {3: "RGB", 4: "RGBA"}       # bytes per pixel of the images without and with alpha
+
+
+def keeps_alpha(name, image):
+    """
+    checks if the decoded image of the file name keeps its per pixel alpha, which only images of ALPHA_IMAGES whose
+    file has an alpha channel do
+    """
+    return name in ALPHA_IMAGES and bool(image.get_flags() & pygame.SRCALPHA)
+
+
+def write_bundle(path, names, folder=img_folder):
+    """
+    decodes the images of the folder once and writes their pixels to a bundle at path
+    """
+    images = []
+    for name in names:
+        image = pygame.image.load(os.path.join(folder, name))
+        images.append((name, image, 4 if keeps_alpha(name, image) else 3))
+    offset = BUNDLE_HEADER.size + BUNDLE_ENTRY.size * len(images)
+    with open(path, "wb") as file:
+        file.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, len(images)))
+        for name, image, depth in images:
+            encoded = name.encode()
+            if len(encoded) > 64:
+                raise ValueError(f"image name {name} is too long for a bundle")
+            file.write(BUNDLE_ENTRY.pack(encoded, image.get_width(), image.get_height(), depth, offset))
+            offset += image.get_width() * image.get_height() * depth
+        for name, image, depth in images:
+            file.write(pygame.image.tobytes(image, PIXEL_FORMATS[depth]))
+
+
+def is_stale(path, names, folder=img_folder):
+    """
+    checks if one of the image files was changed after the bundle at path was written, image files that are missing
+    are left to the bundle
+    """
+    written = os.path.getmtime(path)
+    for name in names:
+        file = os.path.join(folder, name)
+        if os.path.exists(file) and os.path.getmtime(file) > written:
+            return True
+    return False
+
+
+def read_bundle(path):
+    """
+    returns the converted image of every name in the bundle at path, the file is memory mapped and its pixels are
+    turned into surfaces directly, nothing is decoded
+    """
+    images = {}
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, count = BUNDLE_HEADER.unpack_from(data)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+        view = memoryview(data)
+        for index in range(count):
+            name, width, height, depth, offset = BUNDLE_ENTRY.unpack_from(data, BUNDLE_HEADER.size + BUNDLE_ENTRY.size * index)
+            pixels = view[offset:offset + width * height * depth]
+            image = pygame.image.frombuffer(pixels, (width, height), PIXEL_FORMATS[depth])
+            images[name.rstrip(b"\0").decode()] = image.convert_alpha() if depth == 4 else image.convert()
+            pixels.release()                # convert made a copy, the map can be closed
+        view.release()
+    return images
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else BUNDLE_FILE
+    write_bundle(path, BUNDLE_IMAGES)
+    print(f"wrote {len(BUNDLE_IMAGES)} images to {path}")
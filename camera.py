@@ -0,0 +1,59 @@
+import pygame
+from settings import *
+
+
+class Camera:
+    """
+    class for the part of the world that is shown on the screen, all sprites stay in world coordinates
+    """
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        """
+        initializes the camera at the start of the level
+        """
+        self.width = width
+        self.height = height
+        self.x = 0                          # world x of the left edge of the screen
+        self.previous_x = 0                 # world x of the left edge before the last update
+
+    def reset(self):
+        """
+        moves the camera back to the start of the level
+        """
+        self.x = 0
+        self.previous_x = 0
+
+    @property
+    def view(self):
+        """
+        rectangle of the world that is on the screen
+        """
+        return self.view_at(self.x)
+
+    def view_at(self, offset):
+        """
+        rectangle of the world that is on the screen when it is drawn shifted by offset
+        """
+        return pygame.Rect(offset, 0, self.width, self.height)
+
+    def follow(self, rect):
+        """
+        scrolls so the right side of rect stays between the scroll lines of the screen
+        """
+        self.previous_x = self.x
+        screen_right = rect.right - self.x
+        if screen_right >= SCROLL_RIGHT:
+            self.x = rect.right - SCROLL_RIGHT
+        elif screen_right <= SCROLL_LEFT:
+            self.x = rect.right - SCROLL_LEFT
+
+    def offset(self, alpha=1.0):
+        """
+        returns how far the world is shifted on the screen when drawing alpha of the way between two updates
+        """
+        return round(self.previous_x + (self.x - self.previous_x) * alpha)
+
+    def to_world(self, pos):
+        """
+        turns a position on the screen (like the mouse) into a position in the world
+        """
+        return pos[0] + self.x, pos[1]
@@ -0,0 +1,55 @@
+from settings import *
+
+
+class SimClock:
+    """
+    fixed timestep clock for the simulation, it counts updates instead of reading the wall clock
+    """
+    def __init__(self, step=STEP_MS, max_steps=MAX_CATCH_UP_STEPS):
+        """
+        initializes the clock with the length of one update in milliseconds and the most updates allowed per frame
+        """
+        self.step = step
+        self.max_steps = max_steps
+        self.tick = 0                       # amount of updates the simulation has run
+        self.accumulator = 0.0              # real time in milliseconds that has not been simulated yet
+
+    def reset(self):
+        """
+        sets the clock back to the start of a game
+        """
+        self.tick = 0
+        self.accumulator = 0.0
+
+    def advance(self):
+        """
+        moves the simulation one update forward
+        """
+        self.tick += 1
+
+    def get_ticks(self):
+        """
+        returns the simulated time in milliseconds, used instead of pygame.time.get_ticks
+        """
+        return self.tick * self.step
+
+    def steps_due(self, elapsed):
+        """
+        adds the real time that passed since the last frame and returns how many updates have to run to catch up,
+        a frame that took too long runs at most max_steps updates and the rest of its time is dropped
+        """
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """
+        how far the real time is between the last update and the next one, used to interpolate rendering
+        """
+        return self.accumulator / self.step
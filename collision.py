@@ -0,0 +1,79 @@
+from settings import *
+from assets import asset_cache
+
+
+class SpatialHash:
+    """
+    uniform grid that sorts sprites into square cells so collision checks only look at sprites close by
+    """
+    def __init__(self, cell_size=CELL_SIZE):
+        """
+        initializes an empty grid with cells of cell_size pixels
+        """
+        self.cell_size = cell_size
+        self.cells = {}                     # lists of sprites keyed by (column, row) of the cell
+
+    def keys(self, rect):
+        """
+        returns the (column, row) of every cell the rectangle touches
+        """
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        right, bottom = (rect.right - 1) // size, (rect.bottom - 1) // size
+        return [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+
+    def clear(self):
+        """
+        removes all sprites from the grid
+        """
+        self.cells.clear()
+
+    def insert(self, sprite):
+        """
+        adds the sprite to every cell its rectangle touches
+        """
+        cells = self.cells
+        for key in self.keys(sprite.rect):
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [sprite]
+            else:
+                cell.append(sprite)
+
+    def rebuild(self, sprites):
+        """
+        empties the grid and adds all the sprites at their current position
+        """
+        self.cells.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, rect):
+        """
+        returns every sprite in the grid whose rectangle collides with rect, each one once
+        """
+        found = []
+        seen = set()
+        cells = self.cells
+        for key in self.keys(rect):
+            for sprite in cells.get(key, ()):
+                if sprite not in seen:
+                    seen.add(sprite)
+                    if rect.colliderect(sprite.rect):
+                        found.append(sprite)
+        return found
+
+    def pairs(self, sprites):
+        """
+        returns every (sprite, other) where a sprite of sprites collides with an other sprite in the grid, each pair once
+        """
+        return [(sprite, other) for sprite in sprites for other in self.query(sprite.rect)]
+
+
+def masks_overlap(sprite, other):
+    """
+    checks if opaque pixels of two sprites are on top of each other, using the cached masks of their images placed at
+    the top left of their rects, the rects should be known to collide already since this is the slow test
+    """
+    offset = (other.rect.x - sprite.rect.x, other.rect.y - sprite.rect.y)
+    return asset_cache.mask(sprite.image).overlap(asset_cache.mask(other.image), offset) is not None
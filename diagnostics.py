@@ -0,0 +1,135 @@
+import gc, json, tracemalloc
+import pygame
+import sprites
+from settings import *
+
+# sprite classes of sprites.py whose live instances are counted
+SPRITE_CLASSES = [cls for cls in vars(sprites).values()
+                  if isinstance(cls, type) and issubclass(cls, pygame.sprite.Sprite) and cls.__module__ == sprites.__name__]
+# allocations of the diagnostics themselves are left out of the snapshots
+IGNORED = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap>"), tracemalloc.Filter(False, "<unknown>")]
+
+
+def count_instances():
+    """
+    returns how many instances of every sprite class are alive, looked up through the garbage collector
+    """
+    counts = dict.fromkeys(SPRITE_CLASSES, 0)
+    for obj in gc.get_objects():
+        cls = type(obj)
+        if cls in counts:
+            counts[cls] += 1
+    return {cls.__name__: count for cls, count in counts.items()}
+
+
+def top_sites(statistics, amount):
+    """
+    returns the amount biggest statistics of a snapshot or a comparison of snapshots as dicts
+    """
+    sites = []
+    for statistic in statistics[:amount]:
+        frame = statistic.traceback[0]
+        site = {"site": f"{frame.filename}:{frame.lineno}", "size": statistic.size, "count": statistic.count}
+        if hasattr(statistic, "size_diff"):
+            site["size_diff"] = statistic.size_diff
+            site["count_diff"] = statistic.count_diff
+        sites.append(site)
+    return sites
+
+
+class MemoryDiagnostics:
+    """
+    class that traces memory allocations while enabled, it snapshots the heap at the start and end of every round
+    and every interval frames, counts the live sprites and writes what grew to a json lines report
+    """
+    def __init__(self, path=None, interval=DIAGNOSTICS_INTERVAL, top=DIAGNOSTICS_TOP):
+        """
+        initializes the diagnostics, they are only enabled when there is a path for the report
+        """
+        self.path = path
+        self.enabled = path is not None
+        self.interval = interval
+        self.top = top
+        self.round = 0
+        self.frame = 0                      # frames of the current round
+        self.round_start = None             # snapshot and sprite counts at the start of the last round
+        self.round_instances = None
+        self.interval_start = None          # snapshot at the start of the current interval of frames
+        self.file = None
+        if self.enabled:
+            tracemalloc.start()
+            self.file = open(path, "w")
+
+    def snapshot(self):
+        """
+        returns a snapshot of the traced allocations without the ones of the tracing itself
+        """
+        return tracemalloc.take_snapshot().filter_traces(IGNORED)
+
+    def write(self, event, game, **fields):
+        """
+        writes one record with the traced memory of the moment to the report
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        record = {"event": event, "round": self.round, "frame": self.frame, "tick": game.sim_clock.tick,
+                  "current": current, "peak": peak, **fields}
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def start_round(self, game):
+        """
+        snapshots the heap at the start of a round and reports what grew since the start of the last one, a round
+        that starts over from the same state should not grow at all
+        """
+        if not self.enabled:
+            return
+        self.round += 1
+        self.frame = 0
+        snapshot = self.snapshot()
+        instances = count_instances()
+        fields = {"instances": instances, "top": top_sites(snapshot.statistics("lineno"), self.top)}
+        if self.round_start is not None:
+            growth = [site for site in snapshot.compare_to(self.round_start, "lineno") if site.size_diff > 0]
+            fields["growth"] = top_sites(growth, self.top)
+            fields["instance_growth"] = {name: count - self.round_instances[name] for name, count in instances.items()
+                                         if count != self.round_instances[name]}
+        self.write("round_start", game, **fields)
+        self.round_start = snapshot
+        self.round_instances = instances
+        self.interval_start = snapshot
+        tracemalloc.reset_peak()
+
+    def end_frame(self, game):
+        """
+        counts the frame and every interval frames reports which allocations were kept since the last interval,
+        peak minus current shows how much was allocated and thrown away again in between
+        """
+        if not self.enabled:
+            return
+        self.frame += 1
+        if self.frame % self.interval:
+            return
+        snapshot = self.snapshot()
+        growth = [site for site in snapshot.compare_to(self.interval_start, "lineno") if site.size_diff > 0]
+        self.write("interval", game, frames=self.interval, growth=top_sites(growth, self.top))
+        self.interval_start = snapshot
+        tracemalloc.reset_peak()
+
+    def end_round(self, game):
+        """
+        reports the biggest allocation sites and the live sprites at the end of a round
+        """
+        if not self.enabled:
+            return
+        snapshot = self.snapshot()
+        self.write("round_end", game, instances=count_instances(), top=top_sites(snapshot.statistics("lineno"), self.top))
+
+    def close(self):
+        """
+        stops tracing and closes the report
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            tracemalloc.stop()
@@ -0,0 +1,196 @@
+from settings import *
+
+try:                                        # numpy is only needed for the batched entity store
+    import numpy
+except ImportError:
+    numpy = None
+
+FLYINGBOT, GROUNDBOT, BULLET, BOSS_BULLET = range(4)    # kinds of entities in the store
+BOTS = (FLYINGBOT, GROUNDBOT)
+
+
+def round_like_rect(values):
+    """
+    rounds halves away from zero like pygame does when a float is put into a rect
+    """
+    return numpy.copysign(numpy.floor(numpy.abs(values) + 0.5), values)
+
+
+class EntityStore:
+    """
+    class that keeps the position, velocity and kind of all bots and bullets in numpy arrays so they are moved,
+    culled and collided in a few vectorized passes, the sprites are only used to draw them
+    """
+    def __init__(self, capacity=ENTITY_CAPACITY):
+        """
+        initializes the store with room for capacity entities, it grows when more are added
+        """
+        if numpy is None:
+            raise ImportError("the batched entity store needs numpy, install it or run without batching")
+        self.size = 0                       # slots below size may be in use
+        self.free = []                      # slots below size that are not in use
+        self.sprites = []                   # sprite drawn for every slot
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """
+        makes the arrays hold capacity entities, keeping the ones already stored
+        """
+        old = getattr(self, "x", None)
+        arrays = {"x": numpy.float64, "y": numpy.float64, "px": numpy.float64, "py": numpy.float64,
+                  "vx": numpy.float64, "vy": numpy.float64,
+                  "w": numpy.float64, "h": numpy.float64, "kind": numpy.int8, "alive": numpy.bool_}
+        for name, dtype in arrays.items():
+            array = numpy.zeros(capacity, dtype)
+            if old is not None:
+                array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, array)
+        self.sprites.extend([None] * (capacity - len(self.sprites)))
+
+    def add(self, sprite, kind, vx, vy):
+        """
+        stores the sprite at the position of its rect with the velocity vx, vy and returns its slot
+        """
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == len(self.x):
+                self.allocate(len(self.x) * 2)
+            slot = self.size
+            self.size += 1
+        self.sprites[slot] = sprite
+        self.kind[slot] = kind
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+        self.alive[slot] = True
+        sprite.store = self
+        sprite.slot = slot
+        self.place(sprite)
+        return slot
+
+    def place(self, sprite):
+        """
+        copies the rect of a stored sprite into the arrays after it was moved by hand
+        """
+        slot = sprite.slot
+        rect = sprite.rect
+        self.x[slot], self.y[slot], self.w[slot], self.h[slot] = rect.x, rect.y, rect.width, rect.height
+        self.px[slot], self.py[slot] = rect.x, rect.y
+
+    def remove(self, sprite):
+        """
+        takes the sprite out of the store
+        """
+        slot = sprite.slot
+        self.alive[slot] = False
+        self.sprites[slot] = None
+        self.free.append(slot)
+        sprite.store = None
+        sprite.slot = None
+
+    def mask(self, kinds):
+        """
+        returns which of the used slots hold a living entity of one of the kinds
+        """
+        return self.alive[:self.size] & numpy.isin(self.kind[:self.size], kinds)
+
+    def set_velocity(self, kind, vx):
+        """
+        gives every entity of the kind the horizontal velocity vx
+        """
+        self.vx[:self.size][self.mask((kind,))] = vx
+
+    def step(self):
+        """
+        moves every entity by its velocity, rounding like a rect so it matches the sprites' own update, and keeps
+        where they were for drawing between updates
+        """
+        size = self.size
+        alive = self.alive[:size]
+        x, y = self.x[:size], self.y[:size]
+        self.px[:size] = x
+        self.py[:size] = y
+        x[alive] = round_like_rect(x[alive] + self.vx[:size][alive])
+        y[alive] = round_like_rect(y[alive] + self.vy[:size][alive])
+
+    def sprites_at(self, mask):
+        """
+        returns the sprites of the slots set in mask
+        """
+        return [self.sprites[slot] for slot in numpy.flatnonzero(mask)]
+
+    def outside(self, kinds, left, top, right, bottom):
+        """
+        returns the sprites of the kinds whose top left corner is outside the bounds, like the sprites check themselves
+        """
+        size = self.size
+        x, y = self.x[:size], self.y[:size]
+        return self.sprites_at(self.mask(kinds) & ((x < left) | (x > right) | (y < top) | (y > bottom)))
+
+    def overlap_mask(self, kinds, rect):
+        """
+        returns which slots hold an entity of the kinds that collides with rect, using the same test as Rect.colliderect
+        """
+        size = self.size
+        x, y, w, h = self.x[:size], self.y[:size], self.w[:size], self.h[:size]
+        return (self.mask(kinds) & (x < rect.right) & (rect.left < x + w) & (y < rect.bottom) & (rect.top < y + h))
+
+    def overlapping(self, kinds, rect):
+        """
+        returns the sprites of the kinds that collide with rect
+        """
+        return self.sprites_at(self.overlap_mask(kinds, rect))
+
+    def pairs(self, kinds, other_kinds, chunk=1024):
+        """
+        returns every (sprite, other) where an entity of kinds collides with an entity of other_kinds, each pair once,
+        the test is broadcast over chunks of entities so it never builds a matrix bigger than chunk times the others
+        """
+        size = self.size
+        first = numpy.flatnonzero(self.mask(kinds))
+        second = numpy.flatnonzero(self.mask(other_kinds))
+        found = []
+        if len(first) == 0 or len(second) == 0:
+            return found
+        x, y, w, h = self.x[:size], self.y[:size], self.w[:size], self.h[:size]
+        sx, sy, sw, sh = x[second], y[second], w[second], h[second]
+        for start in range(0, len(first), chunk):
+            slots = first[start:start + chunk]
+            fx, fy = x[slots][:, None], y[slots][:, None]
+            hits = ((fx < sx + sw) & (sx < fx + w[slots][:, None]) & (fy < sy + sh) & (sy < fy + h[slots][:, None]))
+            for row, column in zip(*numpy.nonzero(hits)):
+                found.append((self.sprites[slots[row]], self.sprites[second[column]]))
+        return found
+
+    def move_rect(self, sprite):
+        """
+        moves the rect of a stored sprite to its stored position
+        """
+        slot = sprite.slot
+        sprite.rect.topleft = (int(self.x[slot]), int(self.y[slot]))
+
+    def sync(self):
+        """
+        moves the rects of all entities to their stored position
+        """
+        x, y = self.x, self.y
+        for slot in numpy.flatnonzero(self.alive[:self.size]):
+            self.sprites[slot].rect.topleft = (int(x[slot]), int(y[slot]))
+
+    def on_screen(self, view, alpha=1.0):
+        """
+        moves the rects of the entities inside view to where they are alpha of the way between their last and their
+        stored position and returns their sprites for drawing
+        """
+        size = self.size
+        x, y = self.x[:size], self.y[:size]
+        visible = numpy.flatnonzero(self.alive[:size] & (x < view.right) & (view.left < x + self.w[:size]))
+        px, py = self.px[visible], self.py[visible]
+        drawn_x = px + numpy.round((x[visible] - px) * alpha)
+        drawn_y = py + numpy.round((y[visible] - py) * alpha)
+        sprites = []
+        for slot, left, top in zip(visible, drawn_x, drawn_y):
+            sprite = self.sprites[slot]
+            sprite.rect.topleft = (int(left), int(top))
+            sprites.append(sprite)
+        return sprites
@@ -0,0 +1,232 @@
+import pygame
+import random
+import multiprocessing
+from game import Game
+from policies import Action, IDLE
+from sprites import Flyingbot
+from entities import FLYINGBOT, BOTS
+from settings import *
+
+try:                                        # numpy is only needed for the environments
+    import numpy
+except ImportError:
+    numpy = None
+
+PLAYER_SIZE = 7                             # x, y, velocity x, velocity y, on a platform, kills, height above the ground
+BOT_SIZE = 4                                # x and y from the player, 1 for flying bots, 1 if there is a bot
+BOSS_SIZE = 4                               # x and y from the player, health, 1 while the boss is alive
+
+
+class RoboRunnerEnv:
+    """
+    gym style environment around a headless game, every step is one fixed timestep of the game with no window
+    and no frame cap, actions are Action(move, jump, shoot, angle) and observations dicts of numpy arrays
+    """
+    def __init__(self, seed=None, frame=False, frame_size=ENV_FRAME_SIZE, nearest=ENV_NEAREST_BOTS,
+                 max_steps=ENV_MAX_STEPS, level=LEVEL_FILE, batched=False):
+        """
+        initializes the environment, frame adds the screen scaled down to frame_size to the observations,
+        nearest is the amount of bots observed and max_steps cuts episodes off
+        """
+        if numpy is None:
+            raise ImportError("the environment needs numpy, install it to train agents")
+        self.game = Game(headless=True, level=level, batched=batched, policy=self)    # seeded by reset instead of every round
+        self.seed = seed                    # seed of the first episode
+        self.episodes = 0                   # episodes started so far
+        self.frame = frame
+        self.frame_size = frame_size
+        self.nearest = nearest
+        self.max_steps = max_steps
+        self.action = IDLE                  # action the game plays in the next step
+        self.steps = 0                      # steps of the current episode
+        self.kills = 0                      # kills and boss health at the last step, to reward what changed
+        self.boss_health = 0
+
+    def act(self, game):
+        """
+        returns the action of the step to the policy input of the game
+        """
+        return self.action
+
+    def reset(self, seed=None):
+        """
+        starts a new episode and returns its first observation, seed starts the random numbers over, without it the
+        first episode uses the seed of the environment and later ones go on with the random numbers of the last
+        episode so every episode plays out differently
+        """
+        if seed is None and self.episodes == 0:
+            seed = self.seed
+        self.game.setup()
+        if seed is not None:
+            random.seed(seed)
+        self.episodes += 1
+        self.game.playing = True
+        self.action = IDLE
+        self.steps = 0
+        self.kills = 0
+        self.boss_health = self.game.boss.health
+        return self.observe()
+
+    def step(self, action):
+        """
+        plays the action for one update and returns (observation, reward, done, info)
+        """
+        game = self.game
+        self.action = Action(*action)
+        game.events()
+        game.update()
+        self.steps += 1
+        reward = (game.kills - self.kills) + (self.boss_health - game.boss.health)
+        self.kills = game.kills
+        self.boss_health = game.boss.health
+        truncated = game.playing and self.steps >= self.max_steps
+        if game.win:
+            reward += ENV_WIN_REWARD
+        elif not game.playing:
+            reward += ENV_DEATH_REWARD
+        done = not game.playing or truncated
+        info = {"kills": game.kills, "win": game.win, "tick": game.sim_clock.tick, "truncated": truncated}
+        return self.observe(), float(reward), done, info
+
+    def observe(self):
+        """
+        returns the observation of the current state of the game
+        """
+        game = self.game
+        player = game.player
+        x, y = player.rect.centerx, player.rect.centery
+        ground = game.level.index.ground_under(x, y)    # from the middle, the feet sink into the platform stood on
+        height = max(ground.top - player.rect.bottom, 0) if ground is not None else -1     # 0 when standing, -1 over a gap
+        observation = {
+            "player": numpy.array([x, y, player.velocity.x, player.velocity.y, bool(player.platform_hits), game.kills,
+                                   height], numpy.float32),
+            "bots": self.nearest_bots(x, y),
+            "boss": numpy.array([game.boss.rect.centerx - x, game.boss.rect.centery - y, game.boss.health,
+                                 game.boss.alive()], numpy.float32)}
+        if self.frame:
+            observation["frame"] = self.render_frame()
+        return observation
+
+    def nearest_bots(self, x, y):
+        """
+        returns the nearest bots to x, y as rows of BOT_SIZE, rows without a bot are zero
+        """
+        game = self.game
+        entities = game.entities
+        if entities is None:
+            bots = game.bots.sprites()
+            bot_x = numpy.array([bot.rect.centerx for bot in bots], numpy.float32)
+            bot_y = numpy.array([bot.rect.centery for bot in bots], numpy.float32)
+            flying = numpy.array([isinstance(bot, Flyingbot) for bot in bots], numpy.float32)
+        else:                               # the rects of batched bots are only moved for drawing, the store has them
+            slots = numpy.flatnonzero(entities.mask(BOTS))
+            bot_x = (entities.x[slots] + entities.w[slots] // 2).astype(numpy.float32)
+            bot_y = (entities.y[slots] + entities.h[slots] // 2).astype(numpy.float32)
+            flying = (entities.kind[slots] == FLYINGBOT).astype(numpy.float32)
+        rows = numpy.zeros((self.nearest, BOT_SIZE), numpy.float32)
+        dx, dy = bot_x - x, bot_y - y
+        order = numpy.argsort(dx * dx + dy * dy, kind="stable")[:self.nearest]
+        rows[:len(order), 0] = dx[order]
+        rows[:len(order), 1] = dy[order]
+        rows[:len(order), 2] = flying[order]
+        rows[:len(order), 3] = 1
+        return rows
+
+    def render_frame(self):
+        """
+        draws the game on its hidden screen and returns it scaled down to frame_size as a height x width x 3 array
+        """
+        self.game.draw()
+        frame = pygame.transform.smoothscale(self.game.screen, self.frame_size)
+        return pygame.surfarray.array3d(frame).transpose(1, 0, 2)
+
+    def close(self):
+        """
+        ends the game of the environment
+        """
+        self.game.input.close()
+        pygame.quit()
+
+
+def run_worker(connection, kwargs):
+    """
+    runs an environment in a worker process, answering the commands sent over connection until it is closed
+    """
+    env = RoboRunnerEnv(**kwargs)
+    while True:
+        command, argument = connection.recv()
+        if command == "reset":
+            connection.send(env.reset(argument))
+        elif command == "step":
+            observation, reward, done, info = env.step(argument)
+            if done:                        # finished episodes start over so the environments stay in lockstep
+                info["final_observation"] = observation
+                observation = env.reset()
+            connection.send((observation, reward, done, info))
+        elif command == "close":
+            env.close()
+            connection.close()
+            return
+
+
+def stack(observations):
+    """
+    returns the observations of several environments as one dict of arrays with the environment as first axis
+    """
+    return {key: numpy.stack([observation[key] for observation in observations]) for key in observations[0]}
+
+
+class VectorEnv:
+    """
+    class that steps several environments in lockstep, each in its own worker process
+    """
+    def __init__(self, amount, seed=0, **kwargs):
+        """
+        initializes amount environments, environment i plays with seed + i, kwargs are given to every environment
+        """
+        if numpy is None:
+            raise ImportError("the environment needs numpy, install it to train agents")
+        self.amount = amount
+        self.seed = seed
+        self.connections = []
+        self.workers = []
+        for index in range(amount):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=run_worker, args=(worker_connection, dict(kwargs, seed=seed + index)),
+                                             daemon=True)
+            worker.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.workers.append(worker)
+
+    def reset(self):
+        """
+        starts a new episode in every environment and returns their stacked observations
+        """
+        for connection in self.connections:
+            connection.send(("reset", None))
+        return stack([connection.recv() for connection in self.connections])
+
+    def step(self, actions):
+        """
+        plays one action in every environment and returns the stacked observations and arrays of the rewards and
+        dones with a list of infos, environments that are done start a new episode right away
+        """
+        for connection, action in zip(self.connections, actions):
+            connection.send(("step", tuple(action)))
+        results = [connection.recv() for connection in self.connections]
+        observations, rewards, dones, infos = zip(*results)
+        return (stack(observations), numpy.array(rewards, numpy.float32), numpy.array(dones, numpy.bool_),
+                list(infos))
+
+    def close(self):
+        """
+        closes every environment and waits for the workers to end, they are not terminated since SDL catches SIGTERM
+        """
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.connections = []
+        self.workers = []
@@ -1,14 +1,54 @@
 import pygame
 import random
+import os
+import argparse
+import time
 from sprites import *
+from assets import asset_cache, text_cache, AssetLoader
+from clock import SimClock
+from collision import SpatialHash, masks_overlap
+from camera import Camera
+from level import Level
+from render import DirtyRenderer
+from pool import Pool
+from inputs import LiveInput, InputRecorder, ReplayInput, round_path
+from policies import PolicyInput
+from profiler import FrameProfiler
+from snapshot import Snapshot
+from lifetime import LifetimeManager
+from scheduler import Scheduler
+from diagnostics import MemoryDiagnostics
+from entities import EntityStore, FLYINGBOT, GROUNDBOT, BULLET, BOSS_BULLET, BOTS
+
+FAST_SPEEDS = {FLYINGBOT: FLYINGBOT_FAST_SPEED, GROUNDBOT: GROUNDBOT_FAST_SPEED}     # speeds of the bots once they move faster
 
 
 class Game:
     """ This class represents the Game. It contains all the game objects. """
 
-    def __init__(self):
-        """ Set up the game on creation. """
-
+    def __init__(self, headless=False, seed=None, record=None, replay=None, dirty_rects=DIRTY_RECTS, batched=BATCHED,
+                 profile=None, level=LEVEL_FILE, policy=None, diagnostics=None, bundle=BUNDLE_FILE,
+                 pixel_perfect=PIXEL_PERFECT):
+        """ Set up the game on creation. headless games have no window, no frame cap and draw nothing.
+        seed makes every round play out the same for the same inputs. record is the path of the input log
+        the first round is written to, later rounds are written next to it numbered like run.2.log, replay is the path of an input log to play instead of the player.
+        dirty_rects only redraws the parts of the screen that changed. batched moves and collides bots and
+        bullets in numpy arrays instead of one sprite at a time. profile is the path of a .csv or .json file the
+        timings of every frame are streamed to. level is the .csv or binary file the platforms are loaded from.
+        policy plays the game instead of the player, see policies.py. diagnostics is the path of a json lines file
+        memory snapshots of every round are reported to. bundle is the asset bundle the images are loaded from,
+        None decodes the image files. pixel_perfect checks the masks of the sprites whose rects collide so only
+        opaque pixels hit. """
+
+        self.headless = headless
+        self.seed = seed
+        self.record = record
+        self.replay = replay
+        self.policy = policy
+        self.pixel_perfect = pixel_perfect
+        if headless:                      # SDL's dummy drivers need no display or sound card
+            os.environ["SDL_VIDEODRIVER"] = HEADLESS_DRIVER
+            os.environ["SDL_AUDIODRIVER"] = HEADLESS_DRIVER
         # Initialize Pygame
         pygame.init()
         pygame.mixer.init()
@@ -16,18 +56,46 @@ class Game:
         self.screen = pygame.display.set_mode(
             [WIDTH, HEIGHT])
         pygame.display.set_caption(TITLE)
+        # loads all sprite images once and fills the animation frame table of the player, in the background while
+        # the start screen shows unless there is no start screen
+        self.loader = AssetLoader(asset_cache, Player.load_frames, bundle)
+        if headless:
+            self.loader.run()
+        else:
+            self.loader.start()
         self.clock = pygame.time.Clock()  # timer
+        self.sim_clock = SimClock()       # fixed timestep clock the gameplay runs on
+        self.camera = Camera()            # part of the world that is on the screen
+        self.renderer = DirtyRenderer() if dirty_rects else None    # None draws the whole screen every frame
+        self.bullet_pool = Pool(Bullet, BULLET_POOL_SIZE)          # pools that reuse killed sprites instead of making new ones
+        self.boss_bullet_pool = Pool(Bossbullet, BULLET_POOL_SIZE)
+        self.flyingbot_pool = Pool(Flyingbot, BOT_POOL_SIZE)
+        self.groundbot_pool = Pool(Groundbot, BOT_POOL_SIZE)
+        self.entities = EntityStore() if batched else None     # None lets every bot and bullet update itself
+        self.lifetime = LifetimeManager(self)     # despawns bots and bullets that left, lived too long or are too many
+        self.scheduler = Scheduler(self.sim_clock)    # moves the bots and bullets and spawns waves of bots on time
+        self.profiler = FrameProfiler(profile)    # times the phases of every frame when enabled
+        self.diagnostics = MemoryDiagnostics(diagnostics)     # traces memory across rounds when enabled
+        self.profile_key = pygame.key.key_code(PROFILE_KEY)
+        self.bot_grid = SpatialHash()     # broad phase for collisions with bots
+        self.level = Level.load(level)    # platforms of the level, only the chunks near the camera have sprites
+        self.boss_bullet_grid = SpatialHash()    # broad phase for collisions with boss bullets
+        self.input = None                 # where the inputs of the player come from
         self.running = True               # boolean to check if game is running
         self.playing = True               # boolean to check if user is playing
-        self.all_sprites = None           # all sprites group
+        self.bosses = None                # boss sprite group, empty once the boss is killed
         self.platforms = None             # all platform sprites group
         self.bots = None                  # all enemy sprites group
         self.bullets = None               # all bullets sprites group
         self.boss_bullets = None          # all boss bullets sprites group
         self.player = None                # the player of the game
         self.kills = 0                    # amount of kills player has
+        self.harder = False               # waves also bring a ground bot and a boss bullet after HARDER_KILLS kills
+        self.faster = False               # bots move faster after FASTER_KILLS kills
         self.boss = None                  # boss of the game
         self.win = None                   # to see if player has won by killing boss
+        self.start = None                 # snapshot of the start of a round, made by the first setup
+        self.rounds = 0                   # rounds recorded so far, each to its own input log
 
 
 
@@ -35,28 +103,84 @@ class Game:
         """
         Creates a new instance of a game. initializes a new game.
         """
+        self.setup()
+        self.run()                                # calls run function after initializing new game
+
+    def setup(self):
+        """
+        initializes all the sprites and groups of a new game without running it
+        """
+        if self.loader is not None:               # the first round waits for the images to be loaded
+            self.loader.wait()
+            self.loader = None
+        seed = self.seed
+        if self.replay:                           # replays are played with the seed they were recorded with
+            self.input = ReplayInput(self.replay, self.sim_clock)
+            seed = self.input.seed
+        else:
+            self.input = LiveInput() if self.policy is None else PolicyInput(self.policy, self)
+            if self.record:                       # recordings remember their seed so the replay sees the same game
+                if seed is None:
+                    seed = random.randrange(2**32)
+                self.rounds += 1
+                self.input = InputRecorder(self.input, round_path(self.record, self.rounds), seed, self.sim_clock)
+        if self.start is None:
+            self.create()
+            self.start = self.snapshot()          # later rounds restore this instead of making everything again
+        else:
+            self.restore(self.start, rewind_random=False)
+        if seed is not None:
+            random.seed(seed)
+        self.lifetime.start_round()
+        self.diagnostics.start_round(self)
+
+    def create(self):
+        """
+        makes the sprites and groups of the first round
+        """
+        self.sim_clock.reset()
+        self.camera.reset()
+        if self.renderer is not None:
+            self.renderer.reset()
         self.kills = 0
-        self.all_sprites = pygame.sprite.Group()
+        self.harder = False
+        self.faster = False
+        self.bosses = pygame.sprite.Group()
         self.platforms = pygame.sprite.Group()
         self.bots = pygame.sprite.Group()
-        self.bots_timer = 0                       # timer for when to spawn bots
         self.bullets = pygame.sprite.Group()
         self.boss_bullets = pygame.sprite.Group()
+        self.scheduler.reset()
+        if self.entities is None:                 # every group that moves is moved in one call, platforms and the boss never move
+            self.scheduler.add_system(self.bots, move_bots)
+            self.scheduler.add_system(self.bullets, move_bullets)
+            self.scheduler.add_system(self.boss_bullets, move_bullets)
+        else:
+            self.scheduler.add_system(self.entities, EntityStore.step)
+        self.scheduler.every(SPAWN_INTERVAL, self.spawn_wave)
         self.player = Player(self)
         self.boss= Boss(self, self.player)
-        self.all_sprites.add(self.player)
         self.win = False
-        for platform in PLATFORMS:                # adds all platforms made into the sprite groups
-            plat = Platform(*platform)
-            self.all_sprites.add(plat)
-            self.platforms.add(plat)
-        self.run()                                # calls run function after initializing new game
+        self.level.unload()                       # makes the platform sprites of the chunks at the start of the level
+        self.level.stream(self.camera.view, self.platforms)
+
+    def snapshot(self):
+        """
+        returns a snapshot of the round as it is now, to go back to it later with restore
+        """
+        return Snapshot(self)
+
+    def restore(self, snapshot, rewind_random=True):
+        """
+        puts the round back to a snapshot in place, reusing the sprites, rewind_random also puts back the random numbers
+        """
+        snapshot.restore(self, rewind_random)
 
     def events(self):
         """
         handles all the user events in the game(inputs)
         """
-        for event in pygame.event.get():                # loops through all events
+        for event in self.input.events():               # loops through all events
             if event.type == pygame.QUIT:               # quit event when close is clicked to leave window
                 if self.playing:
                     self.playing = False
@@ -64,123 +188,267 @@ class Game:
             if event.type == pygame.KEYDOWN:            # event for when player wants to jump with spacebar
                 if event.key == pygame.K_w:
                     self.player.jump()
+                elif event.key == self.profile_key:     # shows or hides the profiler overlay
+                    self.profiler.toggle_overlay()
             if event.type == pygame.MOUSEBUTTONDOWN:    # event for when player shoots with mouse(creates bullet and adds to sprite group)
-                x, y = pygame.mouse.get_pos()
-                bullet = Bullet(self.player.rect.centerx, self.player.rect.centery, 20, x, y, self.player)
-                self.bullets.add(bullet)
-                self.all_sprites.add(bullet)
+                x, y = self.camera.to_world(event.pos)
+                self.spawn_bullet(x, y)
                 self.player.shooting = True
-
+        if self.input.finished:                         # replay has no inputs left
+            self.playing = False
 
 
     def update(self):
         """
-        update function to update the game every frame.
+        update function to advance the game by one fixed timestep.
         """
-        self.all_sprites.update()                   # updates all sprites
+        self.sim_clock.advance()
+        self.player.update()
+        self.scheduler.run_systems()                # moves the bots and bullets
+        self.lifetime.cull("bots")                  # kills bots once they are off screen
+        self.scheduler.run_due()                    # spawns the waves of bots that are due
 
-        real_time = pygame.time.get_ticks()         # gets time at the moment
+        # Collision detection
+        self.profiler.start("collision")
+        self.collide()
+        self.profiler.stop("collision")
 
+        self.profiler.start("scroll")
+        self.camera.follow(self.player.rect)        # scrolls the screen with the player
+        self.level.stream(self.camera.view, self.platforms)    # makes the platforms that come near and drops far ones
+        self.profiler.stop("scroll")
 
-        if self.kills > 5:                          # checks if kills reach certain point to make game harder by spawning more bots
-            if real_time - self.bots_timer > 2000:
-                self.bots_timer = real_time
-                Groundbot(self, self.player)
-                Flyingbot(self, self.player)
+        if self.boss.health == 0:
+            self.win = True
+            self.playing = False
+        # Game over
+        if self.player.rect.bottom > HEIGHT:
+            self.playing = False
 
-                bullet = Bossbullet(self.boss.rect.centerx, self.boss.rect.centery, 10, self.player.rect.centerx, self.player.rect.centery, self.player)
-                self.boss_bullets.add(bullet)
-                self.all_sprites.add(bullet)
 
+    def spawn_wave(self):
+        """
+        spawns a wave of bots, the scheduler runs it every SPAWN_INTERVAL milliseconds, after HARDER_KILLS kills the
+        waves also bring a ground bot and a boss bullet at the player
+        """
+        if self.harder:
+            self.spawn_bot(self.groundbot_pool, GROUNDBOT)
+            self.spawn_bot(self.flyingbot_pool, FLYINGBOT)
+            self.spawn_boss_bullet(self.player.rect.centerx, self.player.rect.centery)
         else:
-            if real_time - self.bots_timer > 2000:
-                self.bots_timer = real_time
-                Flyingbot(self, self.player)
+            self.spawn_bot(self.flyingbot_pool, FLYINGBOT)
 
+    def add_kill(self):
+        """
+        counts a kill of the player and makes the game harder once the kills pass HARDER_KILLS and FASTER_KILLS
+        """
+        self.kills += 1
+        if not self.harder and self.kills > HARDER_KILLS:
+            self.harder = True
+        if not self.faster and self.kills > FASTER_KILLS:
+            self.speed_up()
 
-        # Collision detection
+    def speed_up(self):
+        """
+        makes the bots that are alive and all the ones spawned from now on move faster
+        """
+        self.faster = True
+        for bot in self.bots:
+            bot.vx = FAST_SPEEDS[FLYINGBOT if isinstance(bot, Flyingbot) else GROUNDBOT]
+        if self.entities is not None:
+            for kind, speed in FAST_SPEEDS.items():
+                self.entities.set_velocity(kind, speed)
+
+    def spawn_bot(self, pool, kind):
+        """
+        spawns a bot of the kind from its pool
+        """
+        bot = pool.acquire(self, self.player)
+        if self.faster:
+            bot.vx = FAST_SPEEDS[kind]
+        self.track(bot, kind)
+        self.lifetime.spawned("bots", bot)
+        return bot
+
+    def spawn_bullet(self, target_x, target_y):
+        """
+        shoots a bullet from the player towards the target in the world
+        """
+        bullet = self.bullet_pool.acquire(self.player.rect.centerx, self.player.rect.centery, 20, target_x, target_y, self.player)
+        self.bullets.add(bullet)
+        self.track(bullet, BULLET)
+        self.lifetime.spawned("bullets", bullet)
+        return bullet
 
-        enemy_hits = pygame.sprite.spritecollide(self.player, self.bots, False)    # checks if player hits bot to make player lose
-        if enemy_hits:
-            self.playing = False
+    def spawn_boss_bullet(self, target_x, target_y):
+        """
+        shoots a bullet from the boss towards the target in the world
+        """
+        bullet = self.boss_bullet_pool.acquire(self.boss.rect.centerx, self.boss.rect.centery, 10, target_x, target_y, self.player)
+        self.boss_bullets.add(bullet)
+        self.track(bullet, BOSS_BULLET)
+        self.lifetime.spawned("boss_bullets", bullet)
+        return bullet
 
-        enemy_hits = pygame.sprite.collide_rect(self.player, self.boss)    # checks if player hits boss to make player lose
-        if enemy_hits:
+    def track(self, sprite, kind):
+        """
+        hands a new bot or bullet to the batched entity store so it is moved there instead of by itself
+        """
+        if self.entities is not None:
+            self.entities.add(sprite, kind, *sprite.velocity())
+
+    def collide(self):
+        """
+        checks the collisions between the player, the boss and the platforms, then the ones of the bots and bullets
+        """
+        if pygame.sprite.collide_rect(self.player, self.boss) and self.overlap(self.player, self.boss):    # checks if player hits boss to make player lose
             self.playing = False
 
-        hits = pygame.sprite.spritecollide(self.player, self.platforms, False)    # checks if player is on platform to keep player from falling
+        hits = self.player.platform_hits            # checks if player is on platform to keep player from falling
         if self.player.velocity.y > 0:
             if hits:
-                self.player.position.y = hits[0].rect.top + 1
+                self.player.position.y = hits[0].top + 1
                 self.player.velocity.y = 0
 
-        for enemy in self.bots:                     # checks if enemy is hit by bullet to kill them and make score go up
-            if pygame.sprite.spritecollide(enemy, self.bullets, False):
-                enemy.kill()
-                self.kills+=1
+        if self.entities is None:
+            self.collide_sprites()
+        else:
+            self.collide_entities()
+        if self.boss.health <= 0 and self.boss.alive():     # kills boss once health is 0
+            self.boss.kill()
+        self.lifetime.cull("bullets", "boss_bullets")     # kills bullets once they left the screen or missed the player
+
+    def overlap(self, sprite, other):
+        """
+        checks if two sprites whose rects collide really hit, which in pixel perfect mode needs opaque pixels of both
+        on top of each other
+        """
+        if not self.pixel_perfect:
+            return True
+        if self.entities is not None:               # the rects of batched sprites are only moved for drawing
+            for each in (sprite, other):
+                if getattr(each, "store", None) is not None:
+                    self.entities.move_rect(each)
+        return masks_overlap(sprite, other)
+
+    def collide_sprites(self):
+        """
+        checks the collisions of the bots and bullets through spatial hashes of this update
+        """
+        self.bot_grid.rebuild(self.bots)
+        self.boss_bullet_grid.rebuild(self.boss_bullets)
 
-        for bullet in self.boss_bullets:            # checks if enemy bullet hits player to make player loose
-            if pygame.sprite.collide_rect(bullet, self.player):
+        if any(self.overlap(self.player, bot) for bot in self.bot_grid.query(self.player.rect)):    # checks if player hits bot to make player lose
+            self.playing = False
+
+        hit_bots = {}
+        for bullet, enemy in self.bot_grid.pairs(self.bullets):    # checks if enemy is hit by bullet to kill them and make score go up
+            if self.overlap(bullet, enemy):
+                hit_bots[enemy] = True              # bullets keep flying through the bots they kill
+        for enemy in hit_bots:
+            enemy.kill()
+            self.add_kill()
+
+        for bullet in self.boss_bullet_grid.query(self.player.rect):    # checks if enemy bullet hits player to make player loose
+            if self.overlap(bullet, self.player):
                 bullet.kill()
                 self.playing = False
 
-        for bullet in self.bullets:                 # checks if bullet hits enemy or goes off screen to kill the bullet
-            if pygame.sprite.spritecollide(bullet, self.bots, False):
-                bullet.kill()
-                self.kills += 1
-            if pygame.sprite.collide_rect(bullet, self.boss):
+        for bullet in self.bullets:                 # checks if bullet hits the boss to kill the bullet
+            if pygame.sprite.collide_rect(bullet, self.boss) and self.overlap(bullet, self.boss):
                 self.boss.health -= 1
                 bullet.kill()
-            if bullet.rect.x > WIDTH or bullet.rect.x < 0:
-                bullet.kill()
-            elif bullet.rect.y > HEIGHT or bullet.rect.y < 0:
-                bullet.kill()
 
-        # Screen Scrolling
-        if self.player.rect.right >= WIDTH/1.7:
-            self.player.position.x -= self.player.velocity.x
-            self.boss.rect.centerx -= 7
-            for platform in self.platforms:
-                platform.rect.x -= 7
-            for bot in self.bots:
-                bot.rect.x -= 5
-        if self.player.rect.right <= WIDTH/2:
-            self.player.position.x += abs(self.player.velocity.x)
-            self.boss.rect.centerx += 7
-            for platform in self.platforms:
-                platform.rect.x += 7
-            for bot in self.bots:
-                bot.rect.x += 5
-
-        if self.boss.health == 0:
-            self.win = True
-            self.playing = False
-        # Game over
-        if self.player.rect.bottom > HEIGHT:
+    def collide_entities(self):
+        """
+        checks the collisions of the bots and bullets with vectorized tests on the batched entity store
+        """
+        entities = self.entities
+        if any(self.overlap(self.player, bot) for bot in entities.overlapping(BOTS, self.player.rect)):    # checks if player hits bot to make player lose
             self.playing = False
 
+        hit_bots = {}
+        for bullet, enemy in entities.pairs((BULLET,), BOTS):      # bullets keep flying through the bots they kill
+            if self.overlap(bullet, enemy):
+                hit_bots[enemy] = True
+        for enemy in hit_bots:
+            enemy.kill()
+            self.add_kill()
+
+        for bullet in entities.overlapping((BOSS_BULLET,), self.player.rect):     # checks if enemy bullet hits player to make player loose
+            if self.overlap(bullet, self.player):
+                bullet.kill()
+                self.playing = False
+
+        for bullet in entities.overlapping((BULLET,), self.boss.rect):    # checks if bullet hits the boss
+            if self.overlap(bullet, self.boss):
+                self.boss.health -= 1
+                bullet.kill()
 
     def draw(self):
         """
         draws screen and all sprites onto screen and displays it
         """
+        alpha = self.sim_clock.alpha
+        offset = self.camera.offset(alpha)
+        if self.renderer is not None:               # dirty rectangle renderer only redraws what changed
+            self.renderer.draw(self, offset, alpha)
+            return
         self.screen.fill(RED)
-        self.all_sprites.draw(self.screen)
-        self.draw_text(str(self.kills), 22, WHITE, WIDTH/2, 20)
-
+        self.screen.blits([(platform.image, platform.rect.move(-offset, 0)) for platform in self.platforms_on_screen(offset)], False)
+        self.screen.blits(self.sprites_on_screen(offset, alpha), False)
+        self.draw_hud()
 
+        self.profiler.start("flip")
         pygame.display.flip()
+        self.profiler.stop("flip")
+
+    def draw_hud(self):
+        """
+        draws the score and the profiler overlay on top of the game and returns the rectangles they cover
+        """
+        return [self.draw_text(str(self.kills), 22, WHITE, WIDTH/2, 20)] + self.profiler.draw(self)
+
+    def platforms_on_screen(self, offset):
+        """
+        returns the platforms on the screen drawn at offset, they are looked up in the level index so long levels cost
+        nothing extra
+        """
+        return self.level.sprites_in(self.camera.view_at(offset))
+
+    def sprites_on_screen(self, offset, alpha):
+        """
+        returns the (image, screen rectangle) of every moving sprite and the player that is on the screen
+        """
+        view = self.camera.view_at(offset)
+        left, right = view.left, view.right
+        boss = [self.boss] if self.boss.alive() and left < self.boss.rect.right and self.boss.rect.left < right else []
+        sprites = [(sprite.image, sprite.rect.move(-offset, 0)) for sprite in boss]
+        if self.entities is None:                   # bots and bullets are drawn between updates like the player
+            sprites += [(sprite.image, sprite.interpolated_rect(alpha).move(-offset, 0))
+                        for group in (self.bots, self.bullets, self.boss_bullets) for sprite in group
+                        if left < sprite.rect.right and sprite.rect.left < right]
+        else:                                       # only the entities on the screen get their rect moved for drawing
+            sprites += [(sprite.image, sprite.rect.move(-offset, 0)) for sprite in self.entities.on_screen(view, alpha)]
+        sprites.append((self.player.image, self.player.interpolated_rect(alpha).move(-offset, 0)))
+        return sprites
+
+    def pool_stats(self):
+        """
+        returns the hits and misses of every sprite pool
+        """
+        return {"bullets": self.bullet_pool.stats(), "boss_bullets": self.boss_bullet_pool.stats(),
+                "flyingbots": self.flyingbot_pool.stats(), "groundbots": self.groundbot_pool.stats()}
 
 
     def draw_text(self, text, size, color, x, y):
         """
         helper function to draw text to the screen
         """
-        font = pygame.font.Font(pygame.font.match_font("arial"), size)
-        text_surface = font.render(text, True, color)
+        text_surface = text_cache.render(text, size, color)
         text_rect = text_surface.get_rect()
         text_rect.midtop = (x, y)
-        self.screen.blit(text_surface, text_rect)
+        return self.screen.blit(text_surface, text_rect)
 
 
     def run(self):
@@ -189,17 +457,61 @@ class Game:
         """
         self.playing = True
         while self.playing:
-            self.clock.tick(FPS)
+            if self.headless:                   # headless games run one update per frame as fast as the cpu allows
+                elapsed = self.sim_clock.step
+            else:
+                elapsed = self.clock.tick(FPS)
+            for _ in range(self.sim_clock.steps_due(elapsed)):     # slow frames run several updates and skip drawing in between
+                self.profiler.start("events")
+                self.events()                   # every update gets the inputs of its own tick so replays stay in step
+                self.profiler.stop("events")
+                if not self.playing:            # a quit or the end of a replay stops before the next update
+                    break
+                self.profiler.start("update")
+                self.update()
+                self.profiler.stop("update")
+                if not self.playing:
+                    break
+            if not self.headless:
+                self.profiler.start("draw")
+                self.draw()
+                self.profiler.stop("draw")
+            self.profiler.end_frame(self)
+            self.diagnostics.end_frame(self)
+        self.diagnostics.end_round(self)
+        self.input.close()
+        return
+
+    def simulate(self, frames):
+        """
+        starts a new game and steps it at most frames times as fast as possible without drawing, returns the amount of frames stepped
+        """
+        self.setup()
+        self.playing = True
+        frame = 0
+        while self.playing and frame < frames:
+            self.profiler.start("events")
             self.events()
+            self.profiler.stop("events")
+            if not self.playing:                # a quit or the end of a replay stops before the next update
+                break
+            self.profiler.start("update")
             self.update()
-            self.draw()
-        return
+            self.profiler.stop("update")
+            self.profiler.end_frame(self)
+            self.diagnostics.end_frame(self)
+            frame += 1
+        self.diagnostics.end_round(self)
+        self.input.close()
+        return frame
 
 
     def show_start_screen(self):
         """
         starting screen for the game
         """
+        if self.headless:
+            return
         self.screen.fill(BLACK)
         self.draw_text(TITLE, 48, WHITE, WIDTH/2, HEIGHT/4)
         self.draw_text("A, D to move, W to jump, Mouse to aim and shoot", 22, WHITE, WIDTH/2, HEIGHT/2)
@@ -220,7 +532,7 @@ class Game:
         """
         Game over or won screen for the game when player looses or wins and wants to play again
         """
-        if self.running:
+        if self.running and not self.headless:
             self.screen.fill(BLACK)
             if win == False:
                 self.draw_text("Game Over", 48, WHITE, WIDTH/2, HEIGHT/4)
@@ -241,10 +553,40 @@ class Game:
                         dont_start = False
 
 if __name__ == '__main__':
-    g = Game()
-    g.show_start_screen()
-    while g.running:
-        g.new()
-        g.show_go_screen(g.win)
-
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--headless", action="store_true", help="run without a window and without the frame cap")
+    parser.add_argument("--frames", type=int, default=FPS*60, help="frames to simulate per headless game")
+    parser.add_argument("--games", type=int, default=1, help="amount of headless games to simulate")
+    parser.add_argument("--seed", type=int, help="seed for the random numbers of every round")
+    parser.add_argument("--record", help="input log to write the first round to, later rounds are numbered like run.2.log")
+    parser.add_argument("--replay", help="input log to play back instead of reading the player")
+    parser.add_argument("--dirty-rects", action="store_true", default=DIRTY_RECTS, help="only redraw the parts of the screen that changed")
+    parser.add_argument("--batched", action="store_true", default=BATCHED, help="move and collide bots and bullets with numpy")
+    parser.add_argument("--pixel-perfect", action="store_true", default=PIXEL_PERFECT, help="only hit where opaque pixels overlap")
+    parser.add_argument("--level", default=LEVEL_FILE, help=".csv or binary level file to play")
+    parser.add_argument("--profile", help="csv or json file to stream the timings of every frame to")
+    parser.add_argument("--overlay", action="store_true", help=f"start with the profiler overlay shown (toggle with {PROFILE_KEY})")
+    parser.add_argument("--diagnostics", help="json lines file to report memory snapshots of every round to")
+    args = parser.parse_args()
+
+    if args.headless:
+        g = Game(headless=True, seed=args.seed, record=args.record, replay=args.replay, batched=args.batched, profile=args.profile,
+                 level=args.level, diagnostics=args.diagnostics, pixel_perfect=args.pixel_perfect)
+        for _ in range(args.games):
+            start = time.perf_counter()
+            frames = g.simulate(args.frames)
+            seconds = time.perf_counter() - start
+            print(f"frames: {frames} kills: {g.kills} win: {g.win} frames per second: {frames/seconds:.0f}")
+    else:
+        g = Game(seed=args.seed, record=args.record, replay=args.replay, dirty_rects=args.dirty_rects, batched=args.batched,
+                 profile=args.profile, level=args.level, diagnostics=args.diagnostics, pixel_perfect=args.pixel_perfect)
+        if args.overlay:
+            g.profiler.toggle_overlay()
+        g.show_start_screen()
+        while g.running:
+            g.new()
+            g.show_go_screen(g.win)
+
+    g.profiler.close()
+    g.diagnostics.close()
     pygame.quit()
@@ -0,0 +1,204 @@
+import pygame, struct, os
+from settings import *
+
+# layout of an input log: a header with the seed of the round, then one record per input stamped with its simulation tick
+LOG_HEADER = struct.Struct("<4sI")
+LOG_RECORD = struct.Struct("<IBhh")
+LOG_MAGIC = b"RRIN"
+
+KEYS, JUMP, SHOOT, QUIT, END = range(5)    # kinds of records in an input log
+KEY_BITS = ((pygame.K_a, 1), (pygame.K_d, 2))    # held keys that are stored as bits of a KEYS record
+
+
+def round_path(path, round):
+    """
+    returns the path the input log of a round is recorded to, the first round uses path and later ones get their
+    number before the extension, like run.2.log
+    """
+    if round <= 1:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{round}{extension}"
+
+
+class LiveInput:
+    """
+    input of the player read from pygame
+    """
+    finished = False                        # live input never runs out
+
+    def events(self):
+        """
+        returns the pygame events since the last call
+        """
+        return pygame.event.get()
+
+    def keys(self):
+        """
+        returns the keys that are held down
+        """
+        return pygame.key.get_pressed()
+
+    def close(self):
+        """
+        nothing to clean up for live input
+        """
+
+
+class InputRecorder:
+    """
+    input that passes another input through and writes it to a binary input log
+    """
+    def __init__(self, source, path, seed, clock):
+        """
+        initializes the recorder that writes the inputs of source to path, stamped with the ticks of clock
+        """
+        self.source = source
+        self.clock = clock
+        self.file = open(path, "wb")
+        self.file.write(LOG_HEADER.pack(LOG_MAGIC, seed))
+        self.held = 0                       # bits of the held keys that were last written
+        self.finished = False
+
+    def write(self, kind, a=0, b=0):
+        """
+        writes one record to the log
+        """
+        self.file.write(LOG_RECORD.pack(self.clock.tick, kind, a, b))
+
+    def events(self):
+        """
+        returns the events of the source and records the ones the game reacts to
+        """
+        events = self.source.events()
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.write(QUIT)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_w:
+                self.write(JUMP)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.write(SHOOT, *event.pos)
+        return events
+
+    def keys(self):
+        """
+        returns the held keys of the source and records them when they changed
+        """
+        keys = self.source.keys()
+        held = 0
+        for key, bit in KEY_BITS:
+            if keys[key]:
+                held |= bit
+        if held != self.held:
+            self.held = held
+            self.write(KEYS, held)
+        return keys
+
+    def close(self):
+        """
+        marks the tick the recording stopped at and closes the log
+        """
+        if not self.file.closed:
+            self.write(END)
+            self.file.close()
+        self.source.close()
+
+
+class ReplayInput:
+    """
+    input that plays an input log back in place of the player
+    """
+    def __init__(self, path, clock):
+        """
+        initializes the replay of the log at path, following the ticks of clock
+        """
+        self.clock = clock
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, self.seed = LOG_HEADER.unpack_from(data)
+        if magic != LOG_MAGIC:
+            raise ValueError(f"{path} is not an input log")
+        records = list(LOG_RECORD.iter_unpack(data[LOG_HEADER.size:]))
+        # held keys are asked for during updates and the other inputs before them, so each kind is followed on its own
+        self.event_records = [record for record in records if record[1] != KEYS]
+        self.key_records = [record for record in records if record[1] == KEYS]
+        self.next_event = 0                 # index of the next event record to play
+        self.next_key = 0                   # index of the next keys record to play
+        self.held = {key: False for key, bit in KEY_BITS}
+        self.finished = False
+
+    def due(self, records, start):
+        """
+        returns the records from start on that are stamped with the current tick or earlier and the index after them
+        """
+        end = start
+        while end < len(records) and records[end][0] <= self.clock.tick:
+            end += 1
+        return records[start:end], end
+
+    def events(self):
+        """
+        returns the recorded events that are due at the current tick
+        """
+        pygame.event.pump()                 # keeps the window responsive while replaying
+        records, self.next_event = self.due(self.event_records, self.next_event)
+        events = []
+        for tick, kind, a, b in records:
+            if kind == JUMP:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_w))
+            elif kind == SHOOT:
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(a, b), button=1))
+            elif kind == QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+            elif kind == END:
+                self.finished = True
+        return events
+
+    def keys(self):
+        """
+        returns the keys that were held at the current tick
+        """
+        records, self.next_key = self.due(self.key_records, self.next_key)
+        for tick, kind, a, b in records:
+            for key, bit in KEY_BITS:
+                self.held[key] = bool(a & bit)
+        return self.held
+
+    def close(self):
+        """
+        nothing to clean up for a replay
+        """
+
+
+class ScriptedInput:
+    """
+    input that asks a script what the player does at every tick
+    """
+    def __init__(self, script, clock):
+        """
+        initializes the input, script is called with the current tick and returns the held keys and a list of events
+        """
+        self.script = script
+        self.clock = clock
+        self.held = {key: False for key, bit in KEY_BITS}
+        self.finished = False
+
+    def events(self):
+        """
+        returns the events the script does at the current tick and remembers the keys it holds
+        """
+        held, events = self.script(self.clock.tick)
+        for key in self.held:
+            self.held[key] = key in held
+        return events
+
+    def keys(self):
+        """
+        returns the keys the script holds
+        """
+        return self.held
+
+    def close(self):
+        """
+        nothing to clean up for a script
+        """
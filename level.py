@@ -0,0 +1,221 @@
+import pygame, csv, struct, sys
+from settings import *
+from sprites import Platform
+
+# layout of a binary level file: a header with the amount of platforms, then x, y, width, height of every platform
+LEVEL_HEADER = struct.Struct("<4sI")
+LEVEL_RECORD = struct.Struct("<4i")
+LEVEL_MAGIC = b"RRLV"
+
+
+def load_platforms(path):
+    """
+    reads the (x, y, width, height) of every platform from a .csv level or a binary level file
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="") as file:
+            return [tuple(int(row[key]) for key in ("x", "y", "width", "height")) for row in csv.DictReader(file)]
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, count = LEVEL_HEADER.unpack_from(data)
+    if magic != LEVEL_MAGIC:
+        raise ValueError(f"{path} is not a level file")
+    return list(LEVEL_RECORD.iter_unpack(data[LEVEL_HEADER.size:LEVEL_HEADER.size + count * LEVEL_RECORD.size]))
+
+
+def save_platforms(path, platforms):
+    """
+    writes the (x, y, width, height) of every platform to a .csv level or a binary level file
+    """
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["x", "y", "width", "height"])
+            writer.writerows(platforms)
+        return
+    with open(path, "wb") as file:
+        file.write(LEVEL_HEADER.pack(LEVEL_MAGIC, len(platforms)))
+        for platform in platforms:
+            file.write(LEVEL_RECORD.pack(*platform))
+
+
+class PlatformIndex:
+    """
+    class that keeps the rectangles of the platforms sorted by their left side in a static bounding volume hierarchy,
+    so the platforms overlapping a rectangle or under a position are found in logarithmic time
+    """
+    def __init__(self, platforms, leaf_size=INDEX_LEAF_SIZE):
+        """
+        initializes the index for a list of (x, y, width, height)
+        """
+        self.rects = sorted((pygame.Rect(platform) for platform in platforms), key=lambda rect: rect.left)
+        self.leaf_size = leaf_size
+        # nodes of the hierarchy, node i covers rects[first[i]:last[i]] inside the box left, top, right, bottom
+        # and has the children below[i] and below[i] + 1 unless below[i] is -1
+        self.left, self.top, self.right, self.bottom = [], [], [], []
+        self.first, self.last, self.below = [], [], []
+        if self.rects:
+            self.reserve(1)
+            self.fill(0, 0, len(self.rects))
+
+    def reserve(self, amount):
+        """
+        adds amount empty nodes at the end of the hierarchy
+        """
+        for nodes in (self.left, self.top, self.right, self.bottom, self.first, self.last, self.below):
+            nodes.extend([0] * amount)
+
+    def fill(self, node, first, last):
+        """
+        fills the node for rects[first:last] and adds its children next to each other
+        """
+        rects = self.rects[first:last]
+        self.left[node] = min(rect.left for rect in rects)
+        self.top[node] = min(rect.top for rect in rects)
+        self.right[node] = max(rect.right for rect in rects)
+        self.bottom[node] = max(rect.bottom for rect in rects)
+        self.first[node] = first
+        self.last[node] = last
+        self.below[node] = -1
+        if last - first > self.leaf_size:
+            middle = (first + last) // 2
+            children = len(self.first)
+            self.below[node] = children
+            self.reserve(2)
+            self.fill(children, first, middle)
+            self.fill(children + 1, middle, last)
+
+    def query(self, left, top, right, bottom):
+        """
+        returns the indices of the platforms that overlap the box, sorted by their left side, using the same test as
+        Rect.colliderect so platforms without width or height never overlap
+        """
+        found = []
+        if not self.rects:
+            return found
+        rects = self.rects
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not (self.left[node] < right and left < self.right[node] and self.top[node] < bottom and top < self.bottom[node]):
+                continue
+            below = self.below[node]
+            if below == -1:
+                for index in range(self.first[node], self.last[node]):
+                    rect = rects[index]
+                    if rect and rect.left < right and left < rect.right and rect.top < bottom and top < rect.bottom:
+                        found.append(index)
+            else:
+                stack.append(below + 1)     # the left child is searched first so the indices come out sorted
+                stack.append(below)
+        return found
+
+    def overlapping_indices(self, rect):
+        """
+        returns the indices of the platforms that collide with rect
+        """
+        if rect.width <= 0 or rect.height <= 0:     # empty rects never collide
+            return []
+        return self.query(rect.left, rect.top, rect.right, rect.bottom)
+
+    def overlapping(self, rect):
+        """
+        returns the rectangles of the platforms that collide with rect, sorted by their left side
+        """
+        return [self.rects[index] for index in self.overlapping_indices(rect)]
+
+    def in_range(self, left, right):
+        """
+        returns the indices of the platforms that reach into the x range from left to right at any height
+        """
+        return self.query(left, -INDEX_FAR, right, INDEX_FAR)
+
+    def ground_under(self, x, y):
+        """
+        returns the rectangle of the highest platform whose top is at or below y at the column x, None if there is none
+        """
+        ground = None
+        for index in self.query(x, y - 1, x + 1, INDEX_FAR):
+            rect = self.rects[index]
+            if rect.top >= y and (ground is None or rect.top < ground.top):
+                ground = rect
+        return ground
+
+
+class Level:
+    """
+    class for a level split into chunks along x, only the chunks near the camera have platform sprites
+    """
+    def __init__(self, platforms, chunk_width=CHUNK_WIDTH):
+        """
+        initializes the level for a list of (x, y, width, height), grouping platforms by the chunk their left side is in
+        """
+        self.index = PlatformIndex(platforms)
+        self.chunk_width = chunk_width
+        self.chunks = {}                    # indices of the platforms of every chunk keyed by chunk number
+        for index, rect in enumerate(self.index.rects):
+            self.chunks.setdefault(rect.left // chunk_width, []).append(index)
+        self.sprites = {}                   # platform sprites of the loaded chunks keyed by platform index
+        self.loaded = set()                 # numbers of the chunks that have sprites
+        self.view_left = None               # left side of the view the chunks were last streamed for
+        self.end = max((rect.right for rect in self.index.rects), default=0)
+
+    @classmethod
+    def load(cls, path, chunk_width=CHUNK_WIDTH):
+        """
+        returns the level stored in a .csv or binary level file
+        """
+        return cls(load_platforms(path), chunk_width)
+
+    def chunks_near(self, view, margin):
+        """
+        returns the numbers of the chunks that have a platform within margin of the view
+        """
+        rects = self.index.rects
+        chunk_width = self.chunk_width
+        return {rects[index].left // chunk_width for index in self.index.in_range(view.left - margin, view.right + margin)}
+
+    def stream(self, view, group, force=False):
+        """
+        makes sprites for the chunks near the view and throws away the ones of chunks far from it, the sprites are
+        added to and removed from group
+        """
+        if not force and self.view_left is not None and abs(view.left - self.view_left) < self.chunk_width // 4:
+            return                          # the view has not moved far enough to change which chunks are needed
+        self.view_left = view.left
+        needed = self.chunks_near(view, CHUNK_LOAD_MARGIN)
+        kept = self.chunks_near(view, CHUNK_EVICT_MARGIN)
+        for chunk in needed - self.loaded:
+            for index in self.chunks[chunk]:
+                sprite = Platform(*self.index.rects[index])
+                self.sprites[index] = sprite
+                group.add(sprite)
+            self.loaded.add(chunk)
+        for chunk in self.loaded - kept:
+            for index in self.chunks[chunk]:
+                self.sprites.pop(index).kill()
+            self.loaded.discard(chunk)
+
+    def unload(self):
+        """
+        throws away the sprites of every chunk
+        """
+        for sprite in self.sprites.values():
+            sprite.kill()
+        self.sprites.clear()
+        self.loaded.clear()
+        self.view_left = None
+
+    def sprites_in(self, rect):
+        """
+        returns the loaded platform sprites that collide with rect, used for drawing
+        """
+        sprites = self.sprites
+        return [sprites[index] for index in self.index.overlapping_indices(rect) if index in sprites]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("usage: python level.py <from .csv or binary level> <to .csv or binary level>")
+        sys.exit(1)
+    save_platforms(sys.argv[2], load_platforms(sys.argv[1]))
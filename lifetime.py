@@ -0,0 +1,107 @@
+from collections import deque
+from settings import *
+from entities import BOTS, BULLET, BOSS_BULLET
+
+# kinds in the batched entity store, most milliseconds alive and most alive at once of every group of transient sprites
+RULES = {"bots": (BOTS, BOT_TTL, BOT_CAP),
+         "bullets": ((BULLET,), BULLET_TTL, BULLET_CAP),
+         "boss_bullets": ((BOSS_BULLET,), BOSS_BULLET_TTL, BOSS_BULLET_CAP)}
+
+
+class LifetimeManager:
+    """
+    class that despawns the bots and bullets that left the world around the screen, lived too long or are too many,
+    and counts how many of them are alive
+    """
+    def __init__(self, game):
+        """
+        initializes the manager for the groups of the game
+        """
+        self.game = game
+        self.ttl = {group: ttl for group, (kinds, ttl, cap) in RULES.items()}
+        self.caps = {group: cap for group, (kinds, ttl, cap) in RULES.items()}     # None lets a group grow without limit
+        self.spawns = {group: deque() for group in RULES}     # (sprite, tick it was born) in the order they spawned
+        self.peak = {group: 0 for group in RULES}            # most sprites that were alive at once this round
+        self.despawned = {group: {"bounds": 0, "ttl": 0, "cap": 0} for group in RULES}
+
+    def reset(self):
+        """
+        forgets the sprites of the last state, when a round starts or a snapshot is restored
+        """
+        for spawns in self.spawns.values():
+            spawns.clear()
+
+    def start_round(self):
+        """
+        starts counting the peaks and despawns of a new round
+        """
+        for group in RULES:
+            self.peak[group] = 0
+            self.despawned[group] = {"bounds": 0, "ttl": 0, "cap": 0}
+
+    def spawned(self, group, sprite, born=None):
+        """
+        starts the life of a sprite added to group, born is the tick it was born at for sprites that are restored
+        """
+        if born is None:                    # a new life has not moved yet, restored sprites keep where they were
+            sprite.previous = None
+        sprite.born = self.game.sim_clock.tick if born is None else born
+        self.spawns[group].append((sprite, sprite.born))
+
+    def bounds(self, group):
+        """
+        returns the left, top, right and bottom of the world a sprite of the group may be in, bots and boss bullets
+        come in from the right and only leave on the left, player bullets leave the screen on every side
+        """
+        left = self.game.camera.x
+        if group == "bullets":
+            return left, 0, left + WIDTH, HEIGHT
+        return left, 0, float("inf"), HEIGHT
+
+    def cull(self, *groups):
+        """
+        despawns the sprites of the groups whose top left corner is out of bounds, that lived longer than their time
+        to live or that are above the cap of their group, oldest first
+        """
+        for group in groups:
+            left, top, right, bottom = self.bounds(group)
+            if self.game.entities is None:
+                leaving = [sprite for sprite in getattr(self.game, group)
+                           if sprite.rect.x < left or sprite.rect.x > right or sprite.rect.y < top or sprite.rect.y > bottom]
+            else:
+                leaving = self.game.entities.outside(RULES[group][0], left, top, right, bottom)
+            for sprite in leaving:
+                sprite.kill()
+            self.despawned[group]["bounds"] += len(leaving)
+            self.expire(group)
+            self.peak[group] = max(self.peak[group], len(getattr(self.game, group)))
+
+    def expire(self, group):
+        """
+        despawns the oldest sprites of the group while they are past their time to live or the group is too big
+        """
+        spawns = self.spawns[group]
+        sprites = getattr(self.game, group)
+        oldest = self.game.sim_clock.tick - self.ttl[group] / self.game.sim_clock.step
+        cap = self.caps[group]
+        while spawns:
+            sprite, born = spawns[0]
+            if not sprite.alive() or sprite.born != born:   # died already or was handed out again by its pool
+                spawns.popleft()
+                continue
+            if born < oldest:
+                reason = "ttl"
+            elif cap is not None and len(sprites) > cap:
+                reason = "cap"
+            else:
+                break
+            spawns.popleft()
+            sprite.kill()
+            self.despawned[group][reason] += 1
+
+    def stats(self):
+        """
+        returns how many sprites of every group are alive, the most that were alive at once and how many were despawned
+        """
+        return {group: {"live": len(getattr(self.game, group)), "peak": self.peak[group], **self.despawned[group]}
+                for group in RULES}
@@ -0,0 +1,107 @@
+import pygame, random
+from collections import namedtuple
+from math import cos, sin, pi
+from settings import *
+
+# what the player does in one update: move is -1 (left), 0 or 1 (right), shoot fires towards angle in radians
+Action = namedtuple("Action", "move jump shoot angle")
+IDLE = Action(0, False, False, 0.0)
+
+
+class RandomPolicy:
+    """
+    policy that does random actions, with its own random numbers so the game's ones are not disturbed
+    """
+    def __init__(self, seed=None, shoot_chance=0.1, jump_chance=0.02):
+        """
+        initializes the policy with the chances to shoot and jump in an update
+        """
+        self.random = random.Random(seed)
+        self.shoot_chance = shoot_chance
+        self.jump_chance = jump_chance
+
+    def act(self, game):
+        """
+        returns a random action
+        """
+        rand = self.random
+        return Action(rand.choice((-1, 0, 1, 1)), rand.random() < self.jump_chance,
+                      rand.random() < self.shoot_chance, rand.uniform(-pi/2, pi/2))
+
+
+class ScriptedPolicy:
+    """
+    policy that repeats a list of (updates, action) over and over
+    """
+    def __init__(self, steps):
+        """
+        initializes the policy, every action in steps is held for its amount of updates
+        """
+        self.steps = steps
+        self.length = sum(updates for updates, action in steps)
+
+    def act(self, game):
+        """
+        returns the action of the script at the current tick of the game
+        """
+        tick = game.sim_clock.tick % self.length
+        for updates, action in self.steps:
+            if tick < updates:
+                return action
+            tick -= updates
+        return IDLE
+
+
+# runs right, shoots ahead every few updates and jumps over the gaps now and then
+RUN_AND_GUN = [(9, Action(1, False, False, 0.0)), (1, Action(1, False, True, 0.0)), (30, Action(1, False, False, 0.0)),
+               (1, Action(1, True, True, -0.3))]
+
+
+class PolicyInput:
+    """
+    input that asks a policy what to do at every update and turns its action into events and held keys
+    """
+    def __init__(self, policy, game):
+        """
+        initializes the input for a policy playing the game
+        """
+        self.policy = policy
+        self.game = game
+        self.held = {pygame.K_a: False, pygame.K_d: False}
+        self.action = IDLE                  # last action of the policy
+        self.finished = False
+
+    def events(self):
+        """
+        asks the policy for its action and returns the jump and shot it wants as events
+        """
+        action = self.action = self.policy.act(self.game)
+        return action_events(action, self.game, self.held)
+
+    def keys(self):
+        """
+        returns the keys the policy holds
+        """
+        return self.held
+
+    def close(self):
+        """
+        nothing to clean up for a policy
+        """
+
+
+def action_events(action, game, held):
+    """
+    sets the held keys for the move of the action and returns the events for its jump and shot, shots aim at a point
+    AIM_DISTANCE pixels from the player at the angle of the action
+    """
+    held[pygame.K_a] = action.move < 0
+    held[pygame.K_d] = action.move > 0
+    events = []
+    if action.jump:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_w))
+    if action.shoot:
+        x = game.player.rect.centerx - game.camera.x + cos(action.angle) * AIM_DISTANCE
+        y = game.player.rect.centery + sin(action.angle) * AIM_DISTANCE
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(int(x), int(y)), button=1))
+    return events
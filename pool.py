@@ -0,0 +1,47 @@
+class Pool:
+    """
+    class that keeps killed sprites of one class around and resets them instead of making new ones
+    """
+    def __init__(self, sprite_class, capacity):
+        """
+        initializes the pool for sprite_class that keeps at most capacity unused sprites
+        """
+        self.sprite_class = sprite_class
+        self.capacity = capacity
+        self.free = []                      # killed sprites waiting to be reused
+        self.hits = 0                       # amount of sprites handed out by reusing one
+        self.misses = 0                     # amount of sprites that had to be made
+
+    def acquire(self, *args):
+        """
+        returns a sprite set up with args, reusing a killed one when there is one
+        """
+        if self.free:
+            self.hits += 1
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            return sprite
+        self.misses += 1
+        sprite = self.sprite_class(*args)
+        sprite.pool = self
+        return sprite
+
+    def release(self, sprite):
+        """
+        takes a killed sprite back, it is thrown away if the pool is full
+        """
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
+
+    def claim(self, sprite):
+        """
+        takes a killed sprite that is brought back by a snapshot out of the unused ones
+        """
+        if sprite in self.free:
+            self.free.remove(sprite)
+
+    def stats(self):
+        """
+        returns how many sprites were reused and how many were made
+        """
+        return {"hits": self.hits, "misses": self.misses, "free": len(self.free), "capacity": self.capacity}
@@ -0,0 +1,128 @@
+import csv, json, os, time
+from collections import deque
+from settings import *
+from assets import text_cache
+
+PHASES = ["events", "update", "collision", "scroll", "draw", "flip"]    # collision and scroll are part of update, flip of draw
+GROUPS = ["bots", "bullets", "boss_bullets", "platforms"]               # sprite groups whose sizes are recorded
+
+
+class FrameProfiler:
+    """
+    class that times the phases of every frame and counts the entities, shows them on an overlay and streams them to a file
+    """
+    def __init__(self, path=None, max_rows=PROFILE_MAX_ROWS, window=PROFILE_WINDOW):
+        """
+        initializes the profiler, frames are written to path (.csv or .json for json lines) which is rolled over to
+        path.1 after max_rows frames, the overlay shows the average of the last window frames
+        """
+        self.path = path
+        self.max_rows = max_rows
+        self.enabled = path is not None     # frames are only timed while enabled
+        self.overlay = False                # draws the numbers on the screen
+        self.history = deque(maxlen=window)     # rows of the last frames
+        self.lines = []                     # text of the overlay, only refreshed once per window so the text cache is not flooded
+        self.times = {}                     # milliseconds spent in every phase during this frame
+        self.started = {}                   # perf counter of the phases that are running
+        self.frame = 0
+        self.file = None
+        self.writer = None
+        self.rows = 0                       # rows in the current file
+
+    def toggle_overlay(self):
+        """
+        shows or hides the overlay, the profiler runs while the overlay is shown
+        """
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or self.path is not None
+
+    def start(self, phase):
+        """
+        starts timing a phase
+        """
+        if self.enabled:
+            self.started[phase] = time.perf_counter()
+
+    def stop(self, phase):
+        """
+        stops timing a phase, a phase that runs several times in a frame adds up, phases that were started before the
+        profiler was turned on are not timed
+        """
+        started = self.started.pop(phase, None)
+        if self.enabled and started is not None:
+            self.times[phase] = self.times.get(phase, 0.0) + (time.perf_counter() - started) * 1000
+
+    def end_frame(self, game):
+        """
+        records the timings of the frame and the sizes of the sprite groups of the game
+        """
+        if not self.enabled:
+            return
+        row = {"frame": self.frame, "tick": game.sim_clock.tick}
+        for phase in PHASES:
+            row[phase] = self.times.get(phase, 0.0)
+        for group in GROUPS:
+            row[group] = len(getattr(game, group))
+        self.history.append(row)
+        self.times = {}
+        self.frame += 1
+        if self.path is not None:
+            self.write(row)
+
+    def write(self, row):
+        """
+        streams a row to the file, starting a new file when the current one is full
+        """
+        if self.file is None or self.rows >= self.max_rows:
+            self.roll()
+        if self.writer is not None:
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+        self.rows += 1
+
+    def roll(self):
+        """
+        moves the full file to path.1 and starts a new one
+        """
+        if self.file is not None:
+            self.file.close()
+            os.replace(self.path, self.path + ".1")
+        self.file = open(self.path, "w", newline="")
+        self.rows = 0
+        self.writer = None
+        if self.path.endswith(".csv"):
+            self.writer = csv.DictWriter(self.file, ["frame", "tick"] + PHASES + GROUPS)
+            self.writer.writeheader()
+
+    def averages(self):
+        """
+        returns the average of every phase and group over the last frames
+        """
+        if not self.history:
+            return {}
+        return {key: sum(row[key] for row in self.history) / len(self.history) for key in PHASES + GROUPS}
+
+    def draw(self, game):
+        """
+        draws the overlay on the screen of the game and returns the rectangles it drew
+        """
+        if not self.overlay:
+            return []
+        if not self.lines or self.frame % self.history.maxlen == 0:
+            averages = self.averages()
+            self.lines = [f"{phase}: {averages.get(phase, 0.0):.2f} ms" for phase in PHASES]
+            self.lines += [f"{group}: {averages.get(group, 0.0):.0f}" for group in GROUPS]
+        rects = []
+        for index, line in enumerate(self.lines):
+            surface = text_cache.render(line, 16, WHITE)
+            rects.append(game.screen.blit(surface, (10, 10 + index * 18)))
+        return rects
+
+    def close(self):
+        """
+        writes the rest of the file to disk
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,71 @@
+import pygame
+from settings import *
+
+
+class DirtyRenderer:
+    """
+    renderer that only redraws and updates the parts of the screen that changed since the last frame
+    """
+    def __init__(self, background=RED):
+        """
+        initializes the renderer that clears changed parts of the screen with the background color
+        """
+        self.background = background
+        self.previous = []                  # screen rectangles drawn on the last frame
+        self.offset = None                  # camera offset of the last frame, None forces a full redraw
+
+    def reset(self):
+        """
+        forces the next frame to redraw the whole screen
+        """
+        self.previous = []
+        self.offset = None
+
+    def draw(self, game, offset, alpha):
+        """
+        draws the game, only touching what changed, and updates the display, when the camera moved the last frame is
+        scrolled along and only the strip of the world that came onto the screen is drawn fresh
+        """
+        screen = game.screen
+        sprites = game.sprites_on_screen(offset, alpha)
+        if self.offset is None or abs(offset - self.offset) >= screen.get_width():      # nothing of the last frame is left
+            self.offset = offset
+            self.background_at(game, screen.get_rect(), offset)
+            self.previous = screen.blits(sprites) + game.draw_hud()
+            game.profiler.start("flip")
+            pygame.display.flip()
+            game.profiler.stop("flip")
+            return
+
+        dx = offset - self.offset
+        self.offset = offset
+        cleared = [rect.move(-dx, 0) for rect in self.previous]     # where the sprites of the last frame are after scrolling
+        if dx:
+            screen.scroll(-dx, 0)
+            if dx > 0:                      # camera moved right so the world came in on the right side
+                strip = pygame.Rect(screen.get_width() - dx, 0, dx, screen.get_height())
+            else:
+                strip = pygame.Rect(0, 0, -dx, screen.get_height())
+            self.background_at(game, strip, offset)
+        for rect in cleared:                # erases the sprites of the last frame and puts back the platforms under them
+            self.background_at(game, rect.clip(screen.get_rect()), offset)
+        drawn = screen.blits(sprites) + game.draw_hud()
+        game.profiler.start("flip")
+        if dx:                              # every pixel moved, but none had to be drawn again
+            pygame.display.update(screen.get_rect())
+        else:
+            pygame.display.update(cleared + drawn)
+        game.profiler.stop("flip")
+        self.previous = drawn
+
+    def background_at(self, game, rect, offset):
+        """
+        fills the rectangle of the screen with the background and the parts of the platforms inside it
+        """
+        if not rect:
+            return
+        game.screen.fill(self.background, rect)
+        world_rect = rect.move(offset, 0)
+        for platform in game.level.sprites_in(world_rect):
+            part = world_rect.clip(platform.rect)
+            game.screen.blit(platform.image, part.move(-offset, 0), part.move(-platform.rect.x, -platform.rect.y))
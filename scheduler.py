@@ -0,0 +1,86 @@
+import heapq
+
+
+class Scheduler:
+    """
+    class that runs the systems of the game every update and its timed events when they are due, a system moves all
+    sprites of a group in one call and static sprites like platforms have no system at all, so an update only costs
+    as much as the sprites that move
+    """
+    def __init__(self, clock):
+        """
+        initializes the scheduler on the simulation clock of the game
+        """
+        self.clock = clock
+        self.systems = []                   # (group, function that updates all sprites of the group at once)
+        self.events = []                    # heap of (tick it is due, order it was added, callback, interval)
+        self.order = 0                      # keeps events due on the same tick in the order they were added
+
+    def add_system(self, group, update):
+        """
+        runs update with the sprites of group every update
+        """
+        self.systems.append((group, update))
+
+    def run_systems(self):
+        """
+        runs every system once
+        """
+        for group, update in self.systems:
+            update(group)
+
+    def due(self, delay, since):
+        """
+        returns the first tick more than delay milliseconds after the tick since
+        """
+        step = self.clock.step
+        start = since * step
+        tick = since + int(delay // step)
+        while tick * step - start <= delay:
+            tick += 1
+        return tick
+
+    def push(self, tick, callback, interval):
+        """
+        adds an event to the heap
+        """
+        heapq.heappush(self.events, (tick, self.order, callback, interval))
+        self.order += 1
+
+    def every(self, interval, callback):
+        """
+        calls callback every time more than interval milliseconds have passed since it was last called
+        """
+        self.push(self.due(interval, self.clock.tick), callback, interval)
+
+    def run_due(self):
+        """
+        calls the callbacks of all events that are due and puts the events back for their next time
+        """
+        events = self.events
+        tick = self.clock.tick
+        while events and events[0][0] <= tick:
+            due, order, callback, interval = heapq.heappop(events)
+            self.push(self.due(interval, tick), callback, interval)
+            callback()
+
+    def reset(self):
+        """
+        drops all systems and events
+        """
+        self.systems.clear()
+        self.events.clear()
+        self.order = 0
+
+    def save(self):
+        """
+        returns the pending events so they can be put back with load
+        """
+        return list(self.events), self.order
+
+    def load(self, state):
+        """
+        puts back pending events returned by save
+        """
+        events, self.order = state
+        self.events = list(events)
@@ -2,23 +2,77 @@ import os
 
 game_folder = os.path.dirname(__file__)
 img_folder = os.path.join(game_folder, "img")
+level_folder = os.path.join(game_folder, "levels")
 
 WIDTH = 800
 HEIGHT = 600
 FPS = 60
+STEP_MS = 1000/FPS              # length of one fixed simulation update in milliseconds
+MAX_CATCH_UP_STEPS = 5          # most updates a slow frame may run before the rest of its time is dropped
+SCROLL_LEFT = WIDTH//2          # the screen scrolls when the right side of the player passes these lines
+SCROLL_RIGHT = int(WIDTH/1.7)
+DIRTY_RECTS = False             # only redraw the changed parts of the screen instead of the whole screen every frame
+BULLET_POOL_SIZE = 256          # most killed bullets kept per pool for reuse
+BOT_POOL_SIZE = 128             # most killed bots kept per pool for reuse
+BOT_TTL = 30000                 # milliseconds of game time a bot lives at most
+BULLET_TTL = 3000               # milliseconds of game time a player bullet lives at most
+BOSS_BULLET_TTL = 30000         # milliseconds of game time a boss bullet lives at most, long enough to cross the level
+BOT_CAP = 256                   # most bots alive at once, the oldest ones are despawned first
+BULLET_CAP = 512                # most player bullets alive at once
+BOSS_BULLET_CAP = 512           # most boss bullets alive at once
+SPAWN_INTERVAL = 2000           # milliseconds of game time between two waves of bots
+HARDER_KILLS = 5                # after more kills than this every wave also brings a ground bot and a boss bullet
+FASTER_KILLS = 15               # after more kills than this bots move faster
+FLYINGBOT_FAST_SPEED = -5       # speeds of the bots once they move faster
+GROUNDBOT_FAST_SPEED = -4
+BATCHED = False                 # move and collide bots and bullets in numpy arrays instead of one sprite at a time
+PIXEL_PERFECT = False           # bots, bullets, the player and the boss only hit when their opaque pixels overlap
+ENTITY_CAPACITY = 1024          # entities the batched store has room for before it grows
+PROFILE_MAX_ROWS = 100000       # frames written to a profile file before it rolls over
+PROFILE_WINDOW = 60             # frames the profiler overlay averages over
+PROFILE_KEY = "f3"              # key that toggles the profiler overlay
+DIAGNOSTICS_INTERVAL = 600      # frames between the memory snapshots of the diagnostics
+DIAGNOSTICS_TOP = 10            # allocation sites listed per memory snapshot
+CELL_SIZE = 128                 # size in pixels of the cells of the collision spatial hash
+AIM_DISTANCE = 200              # pixels from the player that policies aim their shots at
+HEADLESS_DRIVER = "dummy"       # SDL video and audio driver used when running without a display
+ENV_NEAREST_BOTS = 8            # bots the environment observes, nearest to the player first
+ENV_FRAME_SIZE = (84, 84)       # width and height the screen is scaled down to for observed frames
+ENV_MAX_STEPS = FPS * 300       # steps after which an environment episode is cut off
+ENV_WIN_REWARD = 100            # reward for killing the boss, every kill and hit on the boss is worth 1
+ENV_DEATH_REWARD = -10          # reward for dying
 TITLE = "Robot Runner"
+FONT_NAME = "arial"
+TEXT_CACHE_SIZE = 64            # amount of rendered texts kept around for the HUD and menus
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 
+# images the asset cache loads before the game starts (and the ones it keeps a flipped copy of)
+SPRITE_IMAGES = ["ballpurple1.png", "groundbot1.png", "boss.png", "Bullet_002.png", "bossbullet.png"]
+FLIPPED_IMAGES = ["boss.png", "Bullet_002.png"]
+ALPHA_IMAGES = ["bossbullet.png"]   # images that keep the per pixel alpha of their file, the others only use black as transparent
+# frames of every animation of the player facing right, the ones in PLAYER_FLIPPED are mirrored to face left,
+# the others look the same in both directions
+PLAYER_ANIMATIONS = {"idle": ["Idle (1).png", "Idle (9).png"], "walk": ["Run (4).png", "Run (8).png"],
+                     "jump": ["Jump (7).png"], "idle_shoot": ["Shoot (4).png"], "walk_shoot": ["RunShoot (4).png"],
+                     "jump_shoot": ["JumpShoot (5).png"]}
+PLAYER_FLIPPED = ["walk", "jump", "walk_shoot", "jump_shoot"]
+PLAYER_FRAME_MS = 200           # milliseconds every idle and walk frame is shown
+PLAYER_IMAGES = sorted({name for names in PLAYER_ANIMATIONS.values() for name in names})
+BUNDLE_IMAGES = SPRITE_IMAGES + PLAYER_IMAGES   # images packed into the asset bundle
+BUNDLE_FILE = os.path.join(game_folder, "assets.bundle")     # pre-decoded images, made with python bundle.py
+STARTUP_TARGET_MS = 500         # most milliseconds from starting the game to its first frame the startup benchmark accepts
+
 PLAYER_ACCELERATION = 0.5
 PLAYER_FRICTION = -0.05
 PLAYER_GRAVITY = 0.5
 
-PLATFORMS = [(0, HEIGHT-40, 2000, 40), (2300, HEIGHT-40, 2000, 40), (4600, HEIGHT-40, 2000, 40), (6900, HEIGHT-40, 2000, 40), (9000, HEIGHT-40, 2000, 40),
-             (WIDTH/3, HEIGHT/1.7, 200, 30), (800, HEIGHT/1.7, 200, 30), (1200, HEIGHT/3.3, 100, 30), (1900, HEIGHT/1.5, 200, 30), (2200, HEIGHT/3.3, 100, 30),
-             (2600, HEIGHT/1.5, 200, 30), (3100, HEIGHT/1.7, 200, 30), (3700, HEIGHT/3.3, 100, 30), (4300, HEIGHT/1.5, 200, 30), (4900, HEIGHT/3.3, 100, 30),
-             (5300, HEIGHT/1.5, 200, 30), (5700, HEIGHT/1.7, 200, 30), (6000, HEIGHT/3.3, 100, 30), (6500, HEIGHT/1.5, 200, 30), (6900, HEIGHT/3.3, 100, 30),
-             (7200, HEIGHT/1.5, 200, 30), (7600, HEIGHT/1.7, 200, 30), (8000, HEIGHT/3.3, 100, 30), (8500, HEIGHT/1.5, 200, 30), (9000, HEIGHT/3.3, 100, 30)]
+LEVEL_FILE = os.path.join(level_folder, "level1.csv")    # .csv or binary file with the x, y, width, height of every platform
+CHUNK_WIDTH = 1024              # width of the slices of the level that get their platform sprites made and thrown away together
+CHUNK_LOAD_MARGIN = 512         # chunks with platforms this close to the screen get sprites
+CHUNK_EVICT_MARGIN = 1536       # chunks with no platform this close to the screen lose their sprites
+INDEX_LEAF_SIZE = 8             # platforms per leaf of the platform index
+INDEX_FAR = 10**9               # stands in for an endless distance in platform index queries
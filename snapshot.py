@@ -0,0 +1,97 @@
+import pygame
+import random
+from entities import FLYINGBOT, GROUNDBOT, BULLET, BOSS_BULLET
+
+vector = pygame.math.Vector2
+GROUPS = {"bots": None, "bullets": BULLET, "boss_bullets": BOSS_BULLET}     # groups of moving sprites and their entity kind
+
+
+def copy_value(value):
+    """
+    returns a copy of the mutable values sprites keep, other values are shared
+    """
+    if isinstance(value, (pygame.Rect, vector)):
+        return value.copy()
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def save_sprite(sprite):
+    """
+    returns the attributes of the sprite that are kept by snapshots
+    """
+    return {name: copy_value(getattr(sprite, name)) for name in sprite.saved}
+
+
+def load_sprite(sprite, state):
+    """
+    puts the saved attributes back into the sprite
+    """
+    for name, value in state.items():
+        setattr(sprite, name, copy_value(value))
+
+
+class Snapshot:
+    """
+    class for the state of a round at one update, restoring it puts the same sprite objects back in place instead of
+    making new ones, the inputs of recordings and replays are not part of it
+    """
+    def __init__(self, game):
+        """
+        initializes the snapshot of the current state of the game
+        """
+        if game.entities is not None:       # the rects of batched sprites are only moved for drawing
+            game.entities.sync()
+        self.tick = game.sim_clock.tick
+        self.accumulator = game.sim_clock.accumulator
+        self.camera = (game.camera.x, game.camera.previous_x)
+        self.random_state = random.getstate()
+        self.kills = game.kills
+        self.harder = game.harder
+        self.faster = game.faster
+        self.events = game.scheduler.save()
+        self.win = game.win
+        self.playing = game.playing
+        self.player = save_sprite(game.player)
+        self.boss = save_sprite(game.boss)
+        self.boss_alive = game.boss.alive()
+        self.sprites = [(group, sprite, save_sprite(sprite)) for group in GROUPS for sprite in getattr(game, group)]
+
+    def restore(self, game, rewind_random=True):
+        """
+        puts the game back to the state of the snapshot, rewind_random also puts back the random numbers
+        """
+        game.sim_clock.tick = self.tick
+        game.sim_clock.accumulator = self.accumulator
+        game.camera.x, game.camera.previous_x = self.camera
+        if game.renderer is not None:
+            game.renderer.reset()
+        game.kills = self.kills
+        game.harder = self.harder
+        game.faster = self.faster
+        game.scheduler.load(self.events)
+        game.win = self.win
+        game.playing = self.playing
+        load_sprite(game.player, self.player)
+        load_sprite(game.boss, self.boss)
+        if self.boss_alive:
+            game.bosses.add(game.boss)
+        else:
+            game.boss.kill()
+        for group in GROUPS:                # moving sprites of now go back to their pools
+            for sprite in getattr(game, group).sprites():
+                sprite.kill()
+        game.lifetime.reset()
+        for group, sprite, state in self.sprites:     # groups keep their sprites in the order they spawned
+            sprite.pool.claim(sprite)
+            load_sprite(sprite, state)
+            getattr(game, group).add(sprite)
+            kind = GROUPS[group]
+            if kind is None:
+                kind = FLYINGBOT if sprite.pool is game.flyingbot_pool else GROUNDBOT
+            game.track(sprite, kind)
+            game.lifetime.spawned(group, sprite, sprite.born)
+        game.level.stream(game.camera.view, game.platforms, force=True)
+        if rewind_random:
+            random.setstate(self.random_state)
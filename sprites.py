@@ -1,13 +1,19 @@
-import pygame, csv, os, random
+import pygame, random
 from settings import *
+from assets import asset_cache
 from math import *
 vector = pygame.math.Vector2
+RIGHT, LEFT = "right", "left"                       # directions the player faces in the frame table
 
 
 class Player(pygame.sprite.Sprite):
     """
     Player class for the player of the game using a player sprite
     """
+    frames = {}                                     # frames of every animation keyed by (state, direction), shared by all players
+    saved = ("rect", "position", "velocity", "acceleration", "previous_midbottom", "platform_hits", "walking",
+             "jumping", "shooting", "curr_frame", "last_update", "image")     # attributes kept by snapshots
+
     def __init__(self, game):
         """
         initializes the player
@@ -19,12 +25,13 @@ class Player(pygame.sprite.Sprite):
         self.shooting = False                       # checks if player is shooting
         self.curr_frame = 0                         # current fram of player when it has multiple frames
         self.last_update = 0                        # last frame of player when it has multiple frames
-        self.load_images()                          # calls load images method to load the image of player
-        self.image = self.idle_frames[0]            # initial image of player when game starts
-        self.image.set_colorkey(BLACK)              # gets rid of black rectangle of image
+        self.load_frames()                          # fills the frame table the first time a player is made
+        self.show("idle", RIGHT)                    # initial image of player when game starts
         self.rect = self.image.get_rect()           # gets rectangle of image
         self.rect.center = (WIDTH/2, HEIGHT/2)      # initializes location of player
         self.position = vector(WIDTH/2, HEIGHT/2)   # initializes position of player
+        self.previous_midbottom = self.rect.midbottom   # where the player was drawn before the last update
+        self.platform_hits = game.level.index.overlapping(self.rect)    # platforms the player touches, looked up once per update
         self.velocity = vector(0, 0)                # initializes velocity of player
         self.acceleration = vector(0, 0)            # initializes acceleration of player
 
@@ -33,100 +40,95 @@ class Player(pygame.sprite.Sprite):
         overides update in game inorder to check and update player movements
         """
         # changes acceleration of player from the direction it is going (creates friction and gravity)
-        self.acceleration = vector(0, PLAYER_GRAVITY)
-        keys = pygame.key.get_pressed()
+        acceleration = self.acceleration                # the vectors are changed in place instead of making new ones every update
+        acceleration.update(0, PLAYER_GRAVITY)
+        keys = self.game.input.keys()
         if keys[pygame.K_a]:
-            self.acceleration.x = -PLAYER_ACCELERATION
+            acceleration.x = -PLAYER_ACCELERATION
         if keys[pygame.K_d]:
-            self.acceleration.x = PLAYER_ACCELERATION
+            acceleration.x = PLAYER_ACCELERATION
 
 
-        self.acceleration.x += self.velocity.x*PLAYER_FRICTION
-        self.velocity += self.acceleration
-        self.position += self.velocity + 0.5*self.acceleration
+        acceleration.x += self.velocity.x*PLAYER_FRICTION
+        self.velocity += acceleration
+        self.position.x += self.velocity.x + 0.5*acceleration.x
+        self.position.y += self.velocity.y + 0.5*acceleration.y
 
+        self.previous_midbottom = self.rect.midbottom
         self.rect.midbottom = self.position
+        self.platform_hits = self.game.level.index.overlapping(self.rect)
         self.animation()                                         # calls animation to get the image at the certain movement
 
+    def interpolated_rect(self, alpha):
+        """
+        returns the rectangle to draw the player at when the frame is alpha of the way between two updates
+        """
+        rect = self.rect.copy()
+        rect.midbottom = (self.previous_midbottom[0] + (self.rect.midbottom[0]-self.previous_midbottom[0])*alpha,
+                          self.previous_midbottom[1] + (self.rect.midbottom[1]-self.previous_midbottom[1])*alpha)
+        return rect
+
     def jump(self):
         """
         jump method to make player jump if it is on ground
         """
         self.jumping = True
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.platform_hits
         self.rect.x -= 1
         if hits:
             self.velocity.y = -15
 
-    def load_images(self):
+    @classmethod
+    def load_frames(cls):
         """
-        Loads all images of player
+        fills the frame table shared by all players once, every frame comes colorkeyed from the asset cache so
+        restarts load nothing
         """
-        self.idle_frames = [pygame.image.load(os.path.join(img_folder, "Idle (1).png")).convert(),
-                            pygame.image.load(os.path.join(img_folder, "Idle (9).png")).convert()]
-        self.walk_frames_right = [pygame.image.load(os.path.join(img_folder, "Run (4).png")).convert(),
-                                  pygame.image.load(os.path.join(img_folder, "Run (8).png")).convert()]
-        self.walk_frames_left = []
-        for f in self.walk_frames_right:
-            self.walk_frames_left.append(pygame.transform.flip(f, True, False))
-        self.jump_frame = [pygame.image.load(os.path.join(img_folder, "Jump (7).png")).convert(),
-                           pygame.transform.flip(pygame.image.load(os.path.join(img_folder, "Jump (7).png")).convert(), True, False)]
+        if cls.frames:
+            return
+        for state, names in PLAYER_ANIMATIONS.items():
+            cls.frames[state, RIGHT] = [asset_cache.image(name) for name in names]
+            if state in PLAYER_FLIPPED:
+                cls.frames[state, LEFT] = [asset_cache.image(name, True) for name in names]
+            else:
+                cls.frames[state, LEFT] = cls.frames[state, RIGHT]
 
-        self.shooting_frame = [pygame.image.load(os.path.join(img_folder, "Shoot (4).png")).convert(),
-                               pygame.image.load(os.path.join(img_folder, "RunShoot (4).png")).convert(),
-                               pygame.transform.flip(pygame.image.load(os.path.join(img_folder, "RunShoot (4).png")).convert(), True, False),
-                               pygame.image.load(os.path.join(img_folder, "JumpShoot (5).png")).convert(),
-                               pygame.transform.flip(pygame.image.load(os.path.join(img_folder, "JumpShoot (5).png")).convert(), True, False)]
+    def show(self, state, direction, index=0):
+        """
+        switches the image to a frame of the frame table
+        """
+        self.image = self.frames[state, direction][index]
 
     def animation(self):
         """
-        checks which image to load depending on players movement
+        checks which image to show depending on players movement
         """
-        real_time = pygame.time.get_ticks()
-
-        if self.velocity.x >= 0.15 or self.velocity.x <= -0.15:
-            self.walking = True
-        else:
-            self.walking = False
+        real_time = self.game.sim_clock.get_ticks()
+        self.walking = self.velocity.x >= 0.15 or self.velocity.x <= -0.15
 
-
-        if not self.walking and not self.jumping :      # when players idle loads idle image and shooting images when shooting
-            if real_time - self.last_update > 200:
+        if not self.walking and not self.jumping :      # when players idle shows idle image and shooting images when shooting
+            if real_time - self.last_update > PLAYER_FRAME_MS:
                 self.last_update = real_time
-                self.curr_frame = (self.curr_frame+1)% len(self.idle_frames)
-                self.image = self.idle_frames[self.curr_frame]
+                self.curr_frame = (self.curr_frame+1)% len(self.frames["idle", RIGHT])
+                self.show("idle", RIGHT, self.curr_frame)
                 if self.shooting:
-                    self.image = self.shooting_frame[0]
+                    self.show("idle_shoot", RIGHT)
                     self.shooting = False
-                self.image.set_colorkey(BLACK)
 
-        if self.walking:                                # when players walking loads walking images and shooting images when shooting
-            if real_time - self.last_update > 200:
+        if self.walking:                                # when players walking shows walking images and shooting images when shooting
+            if real_time - self.last_update > PLAYER_FRAME_MS:
                 self.last_update = real_time
-                self.curr_frame = (self.curr_frame+1)% len(self.walk_frames_right)
-                if self.velocity.x > 0:
-                    self.image = self.walk_frames_right[self.curr_frame]
-                    if self.shooting:
-                        self.image = self.shooting_frame[1]
-                        self.shooting = False
-                if self.velocity.x < 0:
-                    self.image = self.walk_frames_left[self.curr_frame]
-                    if self.shooting:
-                        self.image = self.shooting_frame[2]
-                        self.shooting = False
-                self.image.set_colorkey(BLACK)
-
-        if self.jumping:                            # when players jumping loads jumping image and shooting images when shooting
-            if self.velocity.x > 0:
-                self.image = self.jump_frame[0]
-                if self.shooting:
-                    self.image = self.shooting_frame[3]
-            if self.velocity.x < 0:
-                self.image = self.jump_frame[1]
+                self.curr_frame = (self.curr_frame+1)% len(self.frames["walk", RIGHT])
+                direction = RIGHT if self.velocity.x > 0 else LEFT
+                self.show("walk", direction, self.curr_frame)
                 if self.shooting:
-                    self.image = self.shooting_frame[4]
-            self.image.set_colorkey(BLACK)
-            if pygame.sprite.spritecollide(self, self.game.platforms, False):
+                    self.show("walk_shoot", direction)
+                    self.shooting = False
+
+        if self.jumping:                            # when players jumping shows jumping image and shooting images when shooting
+            if self.velocity.x != 0:                # keeps the last image while not moving sideways
+                self.show("jump_shoot" if self.shooting else "jump", RIGHT if self.velocity.x > 0 else LEFT)
+            if self.platform_hits:
                 self.jumping = False
 
 
@@ -139,14 +141,52 @@ class Platform(pygame.sprite.Sprite):
         initializes platform
         """
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((width, height))
-        self.image.fill(BLUE)
+        self.image = asset_cache.solid((width, height), BLUE)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
 
-class Flyingbot(pygame.sprite.Sprite):
+class PooledSprite(pygame.sprite.Sprite):
+    """
+    base class for sprites that are handed out by a pool and go back to it when they are killed
+    """
+    pool = None                             # pool the sprite came from, None when it was made without one
+    store = None                            # batched entity store that moves the sprite, None when it moves itself
+    slot = None                             # index of the sprite in its store
+    saved = ("rect", "vx", "vy", "born", "previous")    # attributes kept by snapshots
+    born = 0                                # tick the sprite was spawned at, set by the lifetime manager
+    previous = None                         # top left corner before the last update, None until the sprite moved
+
+    def interpolated_rect(self, alpha):
+        """
+        returns the rectangle to draw the sprite at when the frame is alpha of the way between two updates
+        """
+        rect = self.rect
+        if self.previous is None:
+            return rect.copy()
+        x, y = self.previous
+        return rect.move(x - rect.x + round((rect.x - x) * alpha), y - rect.y + round((rect.y - y) * alpha))
+
+    def velocity(self):
+        """
+        returns how far the sprite moves every update
+        """
+        return self.vx, self.vy
+
+    def kill(self):
+        """
+        removes the sprite from all groups and gives it back to its pool so it can be reused
+        """
+        was_alive = self.alive()
+        pygame.sprite.Sprite.kill(self)
+        if self.store is not None:
+            self.store.remove(self)
+        if was_alive and self.pool is not None:     # sprites killed twice in one update only go back once
+            self.pool.release(self)
+
+
+class Flyingbot(PooledSprite):
     """
     class for flying bots in the game (enemies)
     """
@@ -155,35 +195,24 @@ class Flyingbot(pygame.sprite.Sprite):
         initializes the flying bot
         """
         pygame.sprite.Sprite.__init__(self)
+        self.image = asset_cache.image("ballpurple1.png")
+        self.rect = self.image.get_rect()
+        self.reset(game, player)
+
+    def reset(self, game, player: Player):
+        """
+        puts the bot back at the start of its life so it can be reused
+        """
         self.player = player
         self.game = game
-        game.all_sprites.add(self)
         game.bots.add(self)
-        self.image = pygame.image.load(os.path.join(img_folder, "ballpurple1.png")).convert()
-        self.image.set_colorkey(BLACK)
-        self.rect = self.image.get_rect()
         self.rect.y = random.randrange(HEIGHT/2)
         self.rect.centerx = player.rect.x + 500
         self.vx = -3
         self.vy = 0
 
 
-    def update(self, *args, **kwargs) -> None:
-        """
-        method overrides update in game to update the bot acording to what happens
-        """
-        if self.game.kills > 15:            # checks how many kills player has to make bots faster
-            self.vx = -5
-        self.rect.x += self.vx
-        self.rect.y += self.vy
-
-        if self.rect.x < 0:                 # kills bot once its off screen
-            self.kill()
-        elif self.rect.y > HEIGHT or self.rect.y < 0:
-            self.kill()
-
-
-class Groundbot(pygame.sprite.Sprite):
+class Groundbot(PooledSprite):
     """
     class for ground bots in the game (enemies)
     """
@@ -192,37 +221,29 @@ class Groundbot(pygame.sprite.Sprite):
         initializes the ground bot
         """
         pygame.sprite.Sprite.__init__(self)
+        self.image = asset_cache.image("groundbot1.png")
+        self.rect = self.image.get_rect()
+        self.reset(game, player)
+
+    def reset(self, game, player: Player):
+        """
+        puts the bot back at the start of its life so it can be reused
+        """
         self.player = player
         self.game = game
-        game.all_sprites.add(self)
         game.bots.add(self)
-        self.image = pygame.image.load(os.path.join(img_folder, "groundbot1.png")).convert()
-        self.image.set_colorkey(BLACK)
-        self.rect = self.image.get_rect()
         self.rect.y = HEIGHT - 110
         self.rect.centerx = player.rect.x + 500
         self.vx = -2.5
         self.vy = 0
 
 
-    def update(self, *args, **kwargs) -> None:
-        """
-        method overrides update in game to update the bot acording to what happens
-        """
-        if self.game.kills > 15:            # checks how many kills player has to make bots faster
-            self.vx = -4
-        self.rect.x += self.vx
-        self.rect.y += self.vy
-
-        if self.rect.x < 0:                 # kills bot once its off screen
-            self.kill()
-        elif self.rect.y > HEIGHT or self.rect.y < 0:
-            self.kill()
-
 class Boss(pygame.sprite.Sprite):
     """
     class for boss in the game (enemy)
     """
+    saved = ("rect", "health")              # attributes kept by snapshots
+
     def __init__(self, game, player: Player):
         """
         initializes the boss of the game
@@ -230,73 +251,99 @@ class Boss(pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self)
         self.player = player
         self.game = game
-        game.all_sprites.add(self)
+        game.bosses.add(self)
         self.health = 30
-        self.image = pygame.transform.flip(pygame.image.load(os.path.join(img_folder, "boss.png")).convert(), True, False)
-        self.image.set_colorkey(BLACK)
+        self.image = asset_cache.image("boss.png", True)
         self.rect = self.image.get_rect()
         self.rect.y = HEIGHT/5
         self.rect.centerx = 10000
 
 
-    def update(self, *args, **kwargs) -> None:
-        """
-        method overrides update in game to update the boss acording to what happens
-        """
-        if self.health <= 0:                # kills boss once health is 0
-            self.kill()
-
-
-class Bullet(pygame.sprite.Sprite):
+class Bullet(PooledSprite):
     """
     class for players bullets in the game
     """
+    saved = ("rect", "image", "speed", "dx", "dy", "born", "previous")
+
     def __init__(self, x, y, speed, target_x, target_y, player: Player):
         """
         initializes the bullets of the game
         """
         pygame.sprite.Sprite.__init__(self)
-        self.speed = speed
-        self.image = pygame.image.load(os.path.join(img_folder, "Bullet_002.png")).convert()
-        if target_x < player.rect.x:
-            self.image = pygame.transform.flip(pygame.image.load(os.path.join(img_folder, "Bullet_002.png")).convert(), True, False)
-        self.image.set_colorkey(BLACK)
+        self.image = asset_cache.image("Bullet_002.png")
         self.rect = self.image.get_rect()
+        self.reset(x, y, speed, target_x, target_y, player)
+
+    def reset(self, x, y, speed, target_x, target_y, player: Player):
+        """
+        shoots the bullet again from x, y so it can be reused
+        """
+        self.speed = speed
+        self.image = asset_cache.image("Bullet_002.png", target_x < player.rect.x)   # flipped when shooting to the left
         self.rect.x = x
         self.rect.y = y
         angle = atan2(target_y-self.rect.y, target_x-self.rect.x)           # calculates angle bullet should be shot at
         self.dx = cos(angle)*self.speed
         self.dy = sin(angle)*self.speed
-    def update(self):
+
+    def velocity(self):
         """
-        method overrides update in game to update the bullet acording to what happens
+        returns how far the bullet moves every update
         """
-        self.rect.x += int(self.dx)             # shoots bullet at direction
-        self.rect.y += int(self.dy)
+        return int(self.dx), int(self.dy)
 
 
-class Bossbullet(pygame.sprite.Sprite):
+class Bossbullet(PooledSprite):
     """
     class for boss's bullets in the game
     """
+    saved = ("rect", "speed", "dx", "dy", "born", "previous")
+
     def __init__(self, x, y, speed, target_x, target_y, player: Player):
         """
         initializes the boss's bullets in the game
         """
         pygame.sprite.Sprite.__init__(self)
-        self.speed = speed
-        self.image = pygame.image.load(os.path.join(img_folder, "bossbullet.png"))
-        self.image.set_colorkey(BLACK)
+        self.image = asset_cache.image("bossbullet.png")
         self.rect = self.image.get_rect()
+        self.reset(x, y, speed, target_x, target_y, player)
+
+    def reset(self, x, y, speed, target_x, target_y, player: Player):
+        """
+        shoots the bullet again from x, y so it can be reused
+        """
+        self.speed = speed
         self.rect.x = x
         self.rect.y = y
         angle = atan2(target_y-self.rect.y, target_x-self.rect.x)       # calculates angle bullet should be shot at
         self.dx = cos(angle)*self.speed
         self.dy = sin(angle)*self.speed
-    def update(self):
+
+    def velocity(self):
         """
-        method overrides update in game to update the boss's bullets acording to what happens
+        returns how far the bullet moves every update
         """
-        self.rect.x += int(self.dx)             # shoots bullet at direction
-        self.rect.y += int(self.dy)
+        return int(self.dx), int(self.dy)
+
 
+def move_bots(bots):
+    """
+    moves every bot of the group by its velocity in one loop, the scheduler runs it instead of calling update on
+    every bot
+    """
+    for bot in bots:
+        rect = bot.rect
+        bot.previous = rect.topleft
+        rect.x += bot.vx                    # the lifetime manager kills the bot once its off screen
+        rect.y += bot.vy
+
+
+def move_bullets(bullets):
+    """
+    moves every bullet of the group in its direction in one loop
+    """
+    for bullet in bullets:
+        rect = bullet.rect
+        bullet.previous = rect.topleft
+        rect.x += int(bullet.dx)            # shoots bullet at direction
+        rect.y += int(bullet.dy)
@@ -0,0 +1,83 @@
+import time
+start = time.perf_counter()                 # taken before pygame and the game are imported, they are part of startup
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from settings import *
+
+STEPS = ["imports", "init", "start_screen", "assets", "setup", "first_frame"]     # parts of startup that get timed
+
+
+def measure(bundle, hidden):
+    """
+    starts the game like a player would, with the start screen dismissed right away, and returns the milliseconds
+    spent in every step up to the first frame of the game
+    """
+    if hidden:
+        os.environ["SDL_VIDEODRIVER"] = HEADLESS_DRIVER
+        os.environ["SDL_AUDIODRIVER"] = HEADLESS_DRIVER
+    import pygame
+    from game import Game
+    times = {"imports": time.perf_counter()}
+    game = Game(bundle=bundle)
+    times["init"] = time.perf_counter()
+    pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+    game.show_start_screen()
+    times["start_screen"] = time.perf_counter()
+    if game.loader is not None:
+        game.loader.wait()
+    times["assets"] = time.perf_counter()
+    game.setup()
+    times["setup"] = time.perf_counter()
+    game.draw()
+    times["first_frame"] = time.perf_counter()
+    pygame.quit()
+    result, last = {}, start
+    for step in STEPS:
+        result[step] = (times[step] - last) * 1000
+        last = times[step]
+    result["total"] = (last - start) * 1000
+    return result
+
+
+def run(bundle, hidden, runs):
+    """
+    measures startup in runs fresh processes and returns the median of every step
+    """
+    command = [sys.executable, __file__, "--child", "--bundle", bundle or ""] + (["--hidden"] if hidden else [])
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {step: sorted(sample[step] for sample in samples)[len(samples) // 2] for step in STEPS + ["total"]}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="measure the time from starting the game to its first frame")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to measure, the median is reported")
+    parser.add_argument("--bundle", default=BUNDLE_FILE, help="asset bundle to load, empty to decode the image files")
+    parser.add_argument("--hidden", action="store_true", help="use SDL's dummy video driver instead of a window")
+    parser.add_argument("--target", type=float, default=STARTUP_TARGET_MS, help="most milliseconds startup may take")
+    parser.add_argument("--output", help="file to write the json report to (default: print it)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.bundle or None, args.hidden)))
+        sys.exit(0)
+
+    report = {"target_ms": args.target, "runs": args.runs}
+    if args.bundle and os.path.exists(args.bundle):
+        report["bundle"] = run(args.bundle, args.hidden, args.runs)
+    report["image_files"] = run(None, args.hidden, args.runs)
+    report["passed"] = report.get("bundle", report["image_files"])["total"] <= args.target    # the way the game starts
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+    sys.exit(0 if report["passed"] else 1)
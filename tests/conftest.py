@@ -0,0 +1,18 @@
+import os, sys, tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import settings
+
+# the images of the game are not part of the repository, the tests play with circles of the same names instead
+IMAGE_SIZES = {"ballpurple1.png": (30, 30), "groundbot1.png": (40, 50), "boss.png": (200, 250),
+               "Bullet_002.png": (12, 6), "bossbullet.png": (16, 16)}
+settings.img_folder = tempfile.mkdtemp(prefix="roborunner-img-")
+for name in settings.SPRITE_IMAGES + settings.PLAYER_IMAGES:
+    width, height = IMAGE_SIZES.get(name, (40, 60))
+    image = pygame.Surface((width, height))
+    image.fill(settings.BLACK)
+    pygame.draw.circle(image, (200, 100, 50), (width // 2, height // 2), min(width, height) // 2)
+    pygame.image.save(image, os.path.join(settings.img_folder, name))
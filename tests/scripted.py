@@ -0,0 +1,61 @@
+import pygame
+from game import Game
+from inputs import ScriptedInput
+from benchmark import keep_on_ground
+
+
+def script(tick):
+    """
+    runs right with pauses, jumps now and then and shoots at spots that change with the tick
+    """
+    events = []
+    if tick % 5 == 0:
+        pos = (400 + tick * 37 % 400, 100 + tick * 53 % 460)
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+    if tick % 40 == 0:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_w))
+    held = (pygame.K_d,) if (tick // 200) % 4 != 3 else ()
+    return held, events
+
+
+def new_game(seed=3, **kwargs):
+    """
+    returns a headless game set up to play the script
+    """
+    game = Game(headless=True, seed=seed, bundle=None, **kwargs)
+    start(game)
+    return game
+
+
+def start(game):
+    """
+    starts a new round of the game played by the script
+    """
+    game.setup()
+    game.input = ScriptedInput(script, game.sim_clock)
+    game.playing = True
+
+
+def play(game, updates, each=None):
+    """
+    plays updates of the game, calling each with the game after every update
+    """
+    for _ in range(updates):
+        keep_on_ground(game)
+        game.events()
+        game.update()
+        if each is not None:
+            each(game)
+
+
+def state(game):
+    """
+    returns what the round looks like, to compare two rounds
+    """
+    if game.entities is not None:
+        game.entities.sync()
+    return (game.sim_clock.tick, game.kills, game.win, round(game.player.position.x, 3), round(game.player.position.y, 3),
+            game.boss.health, game.boss.alive(),
+            sorted((type(sprite).__name__, tuple(sprite.rect))
+                   for group in (game.bosses, game.bots, game.bullets, game.boss_bullets) for sprite in group),
+            sorted(tuple(platform.rect) for platform in game.platforms))
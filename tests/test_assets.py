@@ -0,0 +1,59 @@
+import os
+import pygame
+import pytest
+from assets import AssetCache
+from bundle import write_bundle
+
+
+@pytest.fixture
+def folder(tmp_path):
+    """
+    a folder with a boss bullet whose edge is half transparent and a bot without alpha
+    """
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    bullet = pygame.Surface((16, 16), pygame.SRCALPHA)
+    bullet.fill((120, 40, 200, 128))
+    pygame.draw.circle(bullet, (120, 40, 200, 255), (8, 8), 4)
+    pygame.image.save(bullet, os.path.join(tmp_path, "bossbullet.png"))
+    bot = pygame.Surface((30, 30))
+    bot.fill((10, 200, 10))
+    pygame.image.save(bot, os.path.join(tmp_path, "ballpurple1.png"))
+    return tmp_path
+
+
+def test_alpha_images_keep_their_alpha(folder):
+    cache = AssetCache(str(folder))
+    bullet = cache.image("bossbullet.png")
+    assert bullet.get_flags() & pygame.SRCALPHA
+    assert bullet.get_at((0, 0)).a == 128
+    assert bullet.get_at((8, 8)).a == 255
+    assert not cache.image("ballpurple1.png").get_flags() & pygame.SRCALPHA
+
+
+def test_bundle_matches_the_image_files(folder):
+    names = ["bossbullet.png", "ballpurple1.png"]
+    path = os.path.join(folder, "assets.bundle")
+    write_bundle(path, names, str(folder))
+    files, bundled = AssetCache(str(folder)), AssetCache(str(folder))
+    bundled.load_bundle(path)
+    for name in names:
+        expected, image = files.image(name), bundled.image(name)
+        assert image.get_flags() & pygame.SRCALPHA == expected.get_flags() & pygame.SRCALPHA
+        assert pygame.image.tobytes(image, "RGBA") == pygame.image.tobytes(expected, "RGBA")
+    assert bundled.stats()["disk_loads"] == 0
+
+
+def test_stale_bundles_are_not_used(folder):
+    names = ["bossbullet.png", "ballpurple1.png"]
+    path = os.path.join(folder, "assets.bundle")
+    write_bundle(path, names, str(folder))
+    fresh = AssetCache(str(folder))
+    fresh.preload(names, [], path)
+    assert fresh.stats()["bundle_loads"] == 2 and fresh.stats()["disk_loads"] == 0
+    written = os.path.getmtime(path)
+    os.utime(os.path.join(folder, "ballpurple1.png"), (written + 10, written + 10))
+    stale = AssetCache(str(folder))
+    stale.preload(names, [], path)
+    assert stale.stats()["bundle_loads"] == 0 and stale.stats()["disk_loads"] == 2
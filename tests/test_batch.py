@@ -0,0 +1,24 @@
+import pytest
+import batch
+from game import Game
+from policies import RandomPolicy
+
+
+def test_replays_only_play_once():
+    with pytest.raises(ValueError):
+        batch.run_batch(3, "recorded", workers=1, replay="run.log")
+
+
+def test_replays_report_the_seed_they_were_recorded_with(tmp_path):
+    path = str(tmp_path / "run.log")
+    recorder = Game(headless=True, seed=42, record=path, policy=RandomPolicy(5), bundle=None)
+    recorder.simulate(1200)
+    batch.start_worker(batch.LEVEL_FILE, False)
+    outcome = batch.play((7, "recorded", path, 1200))
+    assert outcome["seed"] == 42
+    assert outcome["kills"] == recorder.kills
+
+
+def test_the_recorded_policy_needs_a_replay():
+    with pytest.raises(ValueError):
+        batch.run_batch(1, "recorded", workers=1)
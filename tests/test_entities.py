@@ -0,0 +1,16 @@
+import pytest
+from scripted import new_game, play, state
+
+pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("seed", [1, 3, 7])
+@pytest.mark.parametrize("pixel_perfect", [False, True])
+def test_batched_rounds_end_like_sprite_rounds(seed, pixel_perfect):
+    ends = []
+    for batched in (False, True):
+        game = new_game(seed, batched=batched, pixel_perfect=pixel_perfect)
+        play(game, 3000)
+        ends.append(state(game))
+    assert ends[0] == ends[1]
+    assert ends[0][1] > 15                  # the round got far enough for the bots to speed up
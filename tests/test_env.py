@@ -0,0 +1,44 @@
+import pytest
+from policies import Action
+
+numpy = pytest.importorskip("numpy")
+from env import RoboRunnerEnv
+
+RUN = Action(1, False, False, 0.0)
+
+
+def play(env, seed=None, steps=300):
+    """
+    plays an episode of running right and returns where the bots were at every step
+    """
+    env.reset(seed)
+    bots = []
+    for _ in range(steps):
+        observation, reward, done, info = env.step(RUN)
+        bots.append(observation["bots"].copy())
+        if done:
+            break
+    return numpy.concatenate(bots)
+
+
+def test_episodes_differ_without_a_seed():
+    env = RoboRunnerEnv(seed=3)
+    first = play(env)
+    second = play(env)
+    assert first.shape != second.shape or not numpy.array_equal(first, second)
+
+
+def test_reset_with_a_seed_repeats_the_episode():
+    env = RoboRunnerEnv(seed=3)
+    first = play(env)
+    play(env)
+    assert numpy.array_equal(play(env, 3), first)
+
+
+def test_the_player_observes_the_ground_under_it():
+    env = RoboRunnerEnv(seed=3)
+    env.reset()
+    for _ in range(120):                    # lands on the ground at the start of the level
+        observation, reward, done, info = env.step(Action(0, False, False, 0.0))
+    assert observation["player"][6] == 0
+    assert observation["player"].shape == (7,)
@@ -0,0 +1,75 @@
+import os
+import pygame
+import pytest
+from game import Game
+from inputs import InputRecorder, ScriptedInput, round_path
+from policies import RandomPolicy
+from scripted import script, state
+
+END_TICK = 600
+
+
+def quitting_script(tick):
+    """
+    plays the script of the other tests and quits at END_TICK
+    """
+    held, events = script(tick)
+    if tick == END_TICK:
+        events.append(pygame.event.Event(pygame.QUIT))
+    return held, events
+
+
+def run(game, steps):
+    """
+    runs the set up game with steps updates every frame, like a window that has to catch up
+    """
+    game.sim_clock.steps_due = lambda elapsed: steps
+    game.run()
+    return state(game)
+
+
+def record(path, steps):
+    """
+    records the script played with steps updates every frame and returns the state it ended in
+    """
+    game = Game(headless=True, seed=3, bundle=None)
+    game.setup()
+    game.input = InputRecorder(ScriptedInput(quitting_script, game.sim_clock), path, 3, game.sim_clock)
+    return run(game, steps)
+
+
+def replay(path, steps):
+    """
+    replays the log at path with steps updates every frame and returns the state it ended in
+    """
+    game = Game(headless=True, replay=path, bundle=None)
+    game.setup()
+    return run(game, steps)
+
+
+@pytest.mark.parametrize("recorded_steps, replayed_steps", [(1, 1), (1, 2), (1, 3), (3, 1), (2, 3)])
+def test_replays_match_recordings_with_catch_up_frames(tmp_path, recorded_steps, replayed_steps):
+    path = str(tmp_path / "run.log")
+    recorded = record(path, recorded_steps)
+    assert recorded[0] == END_TICK and recorded[1] > 0      # played to the quit and hit something
+    assert replay(path, replayed_steps) == recorded
+
+
+def test_simulated_replays_stop_at_the_end_of_the_log(tmp_path):
+    path = str(tmp_path / "run.log")
+    recorder = Game(headless=True, seed=5, record=path, policy=RandomPolicy(5), bundle=None)
+    recorder.simulate(400)
+    recorded = state(recorder)
+    player = Game(headless=True, replay=path, bundle=None)
+    assert player.simulate(1000) == recorded[0]
+    assert state(player) == recorded
+
+
+def test_every_recorded_round_gets_its_own_log(tmp_path):
+    path = str(tmp_path / "run.log")
+    game = Game(headless=True, seed=5, record=path, policy=RandomPolicy(5), bundle=None)
+    game.simulate(100)
+    game.simulate(200)
+    assert round_path(path, 2) == str(tmp_path / "run.2.log")
+    assert Game(headless=True, replay=path, bundle=None).simulate(1000) == 100
+    assert Game(headless=True, replay=round_path(path, 2), bundle=None).simulate(1000) == 200
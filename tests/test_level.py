@@ -0,0 +1,55 @@
+import random
+import pygame
+from level import PlatformIndex, Level, load_platforms, save_platforms
+
+
+def random_platforms(amount, seed):
+    """
+    returns amount platforms spread over a long level, many of them overlapping
+    """
+    generator = random.Random(seed)
+    return [(generator.randrange(-500, 2_000_000), generator.randrange(-200, 800), generator.randrange(0, 600),
+             generator.randrange(0, 80)) for _ in range(amount)]
+
+
+def test_index_matches_brute_force():
+    index = PlatformIndex(random_platforms(20000, 1))
+    generator = random.Random(2)
+    for _ in range(500):
+        rect = pygame.Rect(generator.randrange(-1000, 2_001_000), generator.randrange(-300, 900),
+                           generator.randrange(0, 3000), generator.randrange(0, 700))
+        expected = [i for i, platform in enumerate(index.rects) if rect.colliderect(platform)]
+        assert index.overlapping_indices(rect) == expected
+        left, right = rect.left, rect.left + rect.width
+        expected = [i for i, platform in enumerate(index.rects) if platform and platform.left < right and left < platform.right]
+        assert index.in_range(left, right) == expected
+        x, y = rect.left, rect.top
+        below = [platform for platform in index.rects if platform and platform.left <= x < platform.right and platform.top >= y]
+        ground = index.ground_under(x, y)
+        if below:
+            assert ground is not None and ground.top == min(platform.top for platform in below)
+        else:
+            assert ground is None
+
+
+def test_empty_index():
+    assert PlatformIndex([]).overlapping(pygame.Rect(0, 0, 100, 100)) == []
+
+
+def test_level_files_round_trip(tmp_path):
+    platforms = random_platforms(100, 3)
+    for name in ("level.csv", "level.lvl"):
+        path = str(tmp_path / name)
+        save_platforms(path, platforms)
+        assert load_platforms(path) == platforms
+
+
+def test_streaming_keeps_the_chunks_near_the_view():
+    level = Level(random_platforms(2000, 4))
+    group = pygame.sprite.Group()
+    for x in range(0, 200_000, 5_000):
+        view = pygame.Rect(x, 0, 800, 600)
+        level.stream(view, group)
+        shown = sorted(tuple(sprite.rect) for sprite in level.sprites_in(view))
+        assert shown == sorted(tuple(rect) for rect in level.index.overlapping(view))
+        assert len(group) == len(level.sprites)
@@ -0,0 +1,20 @@
+from benchmark import Bots, run_scenario
+from scripted import new_game, start, play
+
+
+def test_peaks_and_despawns_are_counted_per_round():
+    game = new_game()
+    play(game, 600)
+    stats = game.lifetime.stats()
+    assert stats["bullets"]["peak"] > 0 and stats["bullets"]["bounds"] > 0
+    start(game)
+    assert all(counts == {"live": 0, "peak": 0, "bounds": 0, "ttl": 0, "cap": 0}
+               for counts in game.lifetime.stats().values())
+
+
+def test_bot_scenarios_put_the_cap_back():
+    game = new_game()
+    cap = game.lifetime.caps["bots"]
+    result = run_scenario(game, Bots(cap + 100), frames=2, warmup=0)
+    assert result["lifetime"]["bots"]["peak"] == cap + 100
+    assert game.lifetime.caps["bots"] == cap
@@ -0,0 +1,21 @@
+import pygame
+from game import Game
+from profiler import FrameProfiler
+
+
+def test_stop_of_a_phase_started_while_off():
+    profiler = FrameProfiler()
+    profiler.start("events")
+    profiler.toggle_overlay()
+    profiler.stop("events")
+    assert "events" not in profiler.times
+
+
+def test_toggling_the_overlay_during_a_frame():
+    game = Game(headless=True, seed=1, bundle=None)
+    game.setup()
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=game.profile_key))
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    game.run()
+    assert game.profiler.overlay
+    assert game.profiler.frame == 1
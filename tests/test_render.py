@@ -0,0 +1,57 @@
+import hashlib
+import pygame
+from scripted import new_game, play
+
+
+def screens(dirty_rects, updates=900):
+    """
+    plays the script and returns a hash of the screen after every frame that was drawn
+    """
+    game = new_game(dirty_rects=dirty_rects)
+    hashes = []
+
+    def draw(game):
+        game.sim_clock.accumulator = game.sim_clock.step * (game.sim_clock.tick % 3) / 3    # draws between updates too
+        game.draw()
+        hashes.append(hashlib.sha1(pygame.image.tobytes(game.screen, "RGB")).hexdigest())
+
+    play(game, updates, draw)
+    return game, hashes
+
+
+def test_dirty_renderer_draws_the_same_frames():
+    game, full = screens(False)
+    assert game.camera.x > 0                # the camera scrolled
+    assert screens(True)[1] == full
+
+
+def drawn(batched, updates=400):
+    """
+    plays the script and returns where every sprite is drawn in every frame, in no particular order
+    """
+    game = new_game(batched=batched)
+    frames = []
+
+    def draw(game):
+        alpha = (game.sim_clock.tick % 4) / 4
+        offset = game.camera.offset(alpha)
+        frames.append(sorted(tuple(rect) for image, rect in game.sprites_on_screen(offset, alpha)))
+
+    play(game, updates, draw)
+    return frames
+
+
+def test_batched_entities_are_drawn_like_sprites():
+    assert drawn(True) == drawn(False)
+
+
+def test_bullets_are_drawn_between_updates():
+    game = new_game()
+    play(game, 30)
+    bullet = next(iter(game.bullets))
+    x, y = bullet.previous
+    assert x != bullet.rect.x
+    halfway = bullet.interpolated_rect(0.5)
+    assert min(x, bullet.rect.x) < halfway.x < max(x, bullet.rect.x)
+    assert bullet.interpolated_rect(0.0).topleft == (x, y)
+    assert bullet.interpolated_rect(1.0).topleft == bullet.rect.topleft
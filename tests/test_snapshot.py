@@ -0,0 +1,33 @@
+import pytest
+from scripted import new_game, start, play, state
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_restored_snapshot_plays_out_the_same(batched):
+    if batched:
+        pytest.importorskip("numpy")
+    game = new_game(batched=batched)
+    play(game, 1500)
+    snapshot = game.snapshot()
+    play(game, 1500)
+    expected = state(game)
+    game.restore(snapshot)
+    play(game, 1500)
+    assert state(game) == expected
+    assert expected[1] > 15                 # kills, the bots sped up after the snapshot
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_new_rounds_start_the_same(batched):
+    if batched:
+        pytest.importorskip("numpy")
+    game = new_game(batched=batched)
+    first = state(game)
+    play(game, 1000)
+    start(game)
+    assert state(game) == first
+    play(game, 1000)
+    expected = state(game)
+    start(game)
+    play(game, 1000)
+    assert state(game) == expected